@@ -1,8 +1,19 @@
 
-from collections import OrderedDict
+import sys
+from copyreg import dispatch_table
+from collections import namedtuple
+from collections.abc import Mapping
 from itertools import count
+from operator import attrgetter, lt, le, gt, ge
+from time import perf_counter_ns
 from types import MappingProxyType
-from enum import dunder, break_noisily_on_pickle, _StealthProperty
+from importlib import import_module
+from weakref import WeakValueDictionary, ref
+from enum import dunder, _StealthProperty
+from bnum.indexes import Index
+from bnum.parsing import parse_index
+from bnum.ranges import value_order
+from bnum.stream import DecodeIter
 
 '''
 Based on Enum, (c) 2013 Ethan Furman, ethan@stoneleaf.us
@@ -13,12 +24,62 @@ Modifications (c) 2013 Andrew Cooke, andrew@acooke.org
 __all__ = ['ImplicitBnum', 'ExplicitBnum']
 
 
+# the attributes of each instance, when classes are created with slots=True
+SLOTS = ('_value', '_name', '_ordinal')
+
+
 # this is needed because BnumMeta runs multiple times - to create Bnum etc
 # and then to create enum subclasses.  on the first runs, Bnum etc don't exist.
 Bnum ,ImplicitBnum, ExplicitBnum = None, None, None
 
 
-ILLEGAL_NAMES = {'mro', '_create', '_get_mixins', '_find_new'}
+# names that cannot be used for instances, because they are methods of the
+# class (listed in the Names section of the README)
+ILLEGAL_NAMES = {'mro', '_create', '_get_mixins', '_find_new',
+                 'from_values', 'isin', 'parse', 'decode_iter', 'get',
+                 '_find_missing', 'has_value', 'has_name', 'range', 'floor',
+                 'ceil', 'nearest', 'locate'}
+
+
+# marks a value that is not in BnumMeta._missing_cache
+NOT_CACHED = object()
+
+
+# functions called with a BnumEvent at each stage of class construction.  this
+# is empty by default, so that there is no cost unless hooks are added.
+HOOKS = []
+
+# the kinds of event
+CLASS_STARTED = 'class started'
+MEMBER_CREATED = 'member created'
+ALIAS_RESOLVED = 'alias resolved'
+UNSORTED_VALUES = 'unsorted values'
+CLASS_FINISHED = 'class finished'
+
+# cls is the class qualname; name and value are set for members and aliases
+# (for an alias, value is the name of the instance it resolves to); time is
+# from perf_counter_ns() when the event occurs, and elapsed is the time taken
+# (in ns) to construct the member or class, or attempt the sort.
+BnumEvent = namedtuple('BnumEvent', 'kind cls name value time elapsed')
+
+
+def add_hook(hook):
+    '''
+    Add a function that will be called with a BnumEvent at each stage of
+    Bnum class construction (eg to profile the cost of import).
+    '''
+    HOOKS.append(hook)
+
+def remove_hook(hook):
+    '''Remove a function previously added with add_hook.'''
+    HOOKS.remove(hook)
+
+def emit(hooks, kind, cls, name=None, value=None, start=None):
+    time = perf_counter_ns()
+    event = BnumEvent(kind, cls, name, value, time,
+                      0 if start is None else time - start)
+    for hook in hooks:
+        hook(event)
 
 
 def names():
@@ -47,14 +108,15 @@ def bits():
     return value
 
 
-class BnumDict(OrderedDict):
+class BnumDict(dict):
     '''
     The dictionary supplied by BnumMeta to store the class contents.  We
     provide a default value when implicit is true, and allow implicit to
     be enabled via "with implicit".
 
-    An ordered dict is needed to preserve the order of side-effects (things
-    like which alias is preferred).
+    Insertion order is needed to preserve the order of side-effects (things
+    like which alias is preferred).  Defaults are provided by __missing__, so
+    names that are already defined are found without calling Python code.
     '''
 
     def __init__(self, implicit=False, values=names):
@@ -68,20 +130,77 @@ class BnumDict(OrderedDict):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.implicit = False
 
-    def __getitem__(self, item):
-        '''Provide a default value of None.'''
+    def __missing__(self, item):
+        '''Provide a default value (the implicit value, or self).'''
         if self.implicit:
-            if item not in self and not dunder(item):
-                super().__setitem__(item, self.values(item))
-        else:
-            if item not in self and item == 'implicit':
-                return self
-        return super().__getitem__(item)
+            if item[:2] != '__' or not dunder(item):
+                value = self.values(item)
+                dict.__setitem__(self, item, value)
+                return value
+        elif item == 'implicit':
+            return self
+        raise KeyError(item)
 
     def __setitem__(self, name, value):
         if self.implicit and not dunder(name):
             raise TypeError('Cannot use explicit value for %s' % name)
-        return super().__setitem__(name, value)
+        dict.__setitem__(self, name, value)
+
+
+# a sort key for instances (of a single class), which orders them as the
+# class does (by value, or in definition order if values cannot be compared)
+ordinal = attrgetter('_ordinal')
+
+
+def _ordering(compare, name):
+    '''A comparison method (for ordered=True) that compares ordinals.'''
+    def method(self, other):
+        if other.__class__ is self.__class__:
+            return compare(self._ordinal, other._ordinal)
+        return NotImplemented
+    method.__name__ = method.__qualname__ = name
+    return method
+
+
+# the methods added to classes created with ordered=True.  comparison with
+# anything other than an instance of the same class is left to the other
+# object (eg int, for an int mixin)
+ORDERING = dict((name, _ordering(compare, name)) for name, compare in
+                (('__lt__', lt), ('__le__', le), ('__gt__', gt), ('__ge__', ge)))
+
+
+# bnum classes by (module, qualname), so that classes and instances can be
+# unpickled by reference (even if the class is not a module attribute)
+REGISTRY = WeakValueDictionary()
+
+
+def _resolve_class(module, qualname):
+    '''
+    Find a class by module and qualname (when unpickling).  Classes are
+    registered when created; if not found the module is imported.
+    '''
+    try:
+        return REGISTRY[module, qualname]
+    except KeyError:
+        import_module(module)
+    try:
+        return REGISTRY[module, qualname]
+    except KeyError:
+        raise AttributeError('No Bnum class %s in %s' % (qualname, module))
+
+
+def _resolve_instance(cls, name):
+    '''Find an instance by name (when unpickling).'''
+    return cls._enums_by_name[name]
+
+
+def _reduce_class(cls):
+    '''
+    Pickle a class by reference.  The pickler memoizes the class, so this is
+    stored only once per pickle, and each instance is then a reference to
+    the class plus the (also memoized) name.
+    '''
+    return _resolve_class, (cls.__module__, cls.__qualname__)
 
 
 class BnumMeta(type):
@@ -92,16 +211,29 @@ class BnumMeta(type):
     __new__ constructs the class.
     '''
 
+    # true for metaclasses whose classes can gain instances after creation
+    # (see bnum.extensible)
+    _extensible = False
+
     def __init__(metacls, cls, bases=None, dict=None,
-                 values=None, allow_aliases=False):
+                 values=None, allow_aliases=False, fast_attributes=False,
+                 slots=False, ordered=False, missing_cache=0):
         super().__init__(cls, bases, dict)
 
     def __new__(metacls, cls, bases, classdict,
-                values=None, allow_aliases=False):
+                values=None, allow_aliases=False, fast_attributes=False,
+                slots=False, ordered=False, missing_cache=0):
         '''
 
         '''
 
+        # copy so that hooks are consistent for the whole class
+        hooks = tuple(HOOKS)
+        if hooks:
+            qualname = classdict.get('__qualname__', cls)
+            class_start = perf_counter_ns()
+            emit(hooks, CLASS_STARTED, qualname)
+
         # i'm just going to trust Enum has this inheritance stuff right...
         obj_type, first_enum = metacls._get_mixins(bases)
         __new__, save_new, use_args = \
@@ -113,51 +245,71 @@ class BnumMeta(type):
         enums_by_name = {}
 
         # check for illegal enum names
-        if set(enum_dict.keys()) & ILLEGAL_NAMES:
-            raise ValueError('Enumeration names cannot include '
-                             + ','.join(ILLEGAL_NAMES))
+        if not ILLEGAL_NAMES.isdisjoint(enum_dict):
+            raise ValueError('Enumeration names cannot include %s (used by '
+                             'the class)' % ', '.join(
+                                 sorted(ILLEGAL_NAMES.intersection(enum_dict))))
+
+        # instances are found by __getattr__ unless they are all going to be
+        # class attributes (and so found by normal lookup, which is faster)
+        if enum_dict and not (fast_attributes and
+                              metacls._can_be_attributes(enum_dict, bases, others)):
+            metacls = metacls._lookup_metaclass()
+
+        # with slots, instances have no __dict__ (if the mixin type allows
+        # it - variable sized types like int and tuple do not)
+        if slots and not obj_type.__itemsize__:
+            declared = others.get('__slots__', ())
+            if isinstance(declared, str):
+                declared = (declared, )
+            others['__slots__'] = tuple(declared) + \
+                (SLOTS if enum_dict or metacls._extensible else ())
 
         # create the (empty) Bnum type
         enum_class = super().__new__(metacls, cls, bases, others)
+        enum_class._obj_type = obj_type
         # define early so that __members__ can be used in construction
         enum_class._enums_by_name = enums_by_name
+        enum_class._members_proxy = MappingProxyType(enums_by_name)
+
+        # classes and instances are pickled by reference (see _resolve_class)
+        REGISTRY[enum_class.__module__, enum_class.__qualname__] = enum_class
+        dispatch_table[type(enum_class)] = _reduce_class
 
-        # again, trust Enum on this...
-        if obj_type is not object and obj_type.__dict__.get('__getnewargs__') is None:
-            enum_class.__reduce__ = break_noisily_on_pickle
-            enum_class.__module__ = 'uh uh'  # wtf does this mean?
+        # without a custom __new__ or __init__, instances are created inline
+        # (_create_member would do the same, but the call is a large part of
+        # the cost for big classes)
+        simple = not use_args and enum_class.__init__ is object.__init__ \
+            and metacls._create_member is BnumMeta._create_member
 
         # instantiate and then check for values (as Enum - someone could use
         # the constructor to do auto-numbering...)
         for name, value in enum_dict.items():
-            # again, trust Enum...
-            if not isinstance(value, tuple):
-                args = (value, )
-            else:
-                args = value
-            if obj_type is tuple:   # special case for tuple enums
-                args = (args, )     # wrap it one more time
-            if not use_args:
+            if hooks:
+                start = perf_counter_ns()
+            if simple:
                 enum_item = __new__(enum_class)
                 enum_item._value = value
+                enum_item._name = name
             else:
-                enum_item = __new__(enum_class, *args)
-                if not hasattr(enum_item, '_value'):
-                    enum_item._value = obj_type(*args)
-            enum_item._obj_type = obj_type
-            enum_item._name = name
-            enum_item.__init__(*args)
-
-            print(repr(enum_item))
-            if enum_item.value in enums_by_value:
-                if allow_aliases:
-                    enums_by_name[name] = enums_by_value[enum_item.value]
-                else:
-                    raise ValueError('Duplicate value for %s, %s' %
-                                     (name, enums_by_value[enum_item.value].name))
-            else:
+                enum_item = metacls._create_member(enum_class, name, value,
+                                                   obj_type, __new__, use_args)
+                value = enum_item._value
+            # a single lookup, which either adds the instance or finds the
+            # instance that already has the value
+            previous = enums_by_value.setdefault(value, enum_item)
+            if previous is enum_item:
                 enums_by_name[name] = enum_item
-                enums_by_value[enum_item.value] = enum_item
+                if hooks:
+                    emit(hooks, MEMBER_CREATED, qualname, name, value, start)
+            elif allow_aliases:
+                enums_by_name[name] = previous
+                if hooks:
+                    emit(hooks, ALIAS_RESOLVED, qualname, name,
+                         previous._name, start)
+            else:
+                raise ValueError('Duplicate value for %s, %s' %
+                                 (name, previous._name))
 
         # more pickle-related logic from Enum
         for name in ('__repr__', '__str__', '__getnewargs__'):
@@ -171,27 +323,150 @@ class BnumMeta(type):
                 enum_class.__new_member__ = __new__
             enum_class.__new__ = Bnum.__new__
 
+        if hooks:
+            start = perf_counter_ns()
         try:
-            enum_class._enums_by_value = \
-                OrderedDict((value, enums_by_value[value])
-                            for value in sorted(enums_by_value.keys()))
-        except:
+            in_order = sorted(enums_by_value)
+        except Exception:  # values that cannot be compared (eg Decimal NaN)
+            enum_class._enums_by_value = enums_by_value
+            if hooks:
+                emit(hooks, UNSORTED_VALUES, qualname, start=start)
+        else:
+            # values are often defined in order, so avoid a copy if possible
+            if in_order != list(enums_by_value):
+                enums_by_value = dict(zip(in_order, map(enums_by_value.__getitem__,
+                                                        in_order)))
             enum_class._enums_by_value = enums_by_value
 
+        # the instances in value order, used for iteration and indexing.
+        # ordinals are the position in this tuple (aliases share the ordinal
+        # of the instance they refer to)
+        enum_class._members = tuple(enum_class._enums_by_value.values())
+        for ordinal, enum_item in enumerate(enum_class._members):
+            enum_item._ordinal = ordinal
+
+        # built on first use (see parse and range)
+        enum_class._parse_index = None
+        enum_class._value_order = None
+
+        # the _missing_ hook (if the class defines one), and a cache of its
+        # results (see _find_missing)
+        enum_class._missing_hook = None \
+            if getattr(enum_class._missing_, '__func__', None) is MISSING \
+            else enum_class._missing_
+        enum_class._missing_cache = {} if missing_cache else None
+        enum_class._missing_cache_size = missing_cache
+
+        # with ordered, instances of the class compare by ordinal (unless the
+        # class defines its own comparisons)
+        if ordered:
+            for name, method in ORDERING.items():
+                if name not in others:
+                    setattr(enum_class, name, method)
+
+        # with slots, read name and value without calling python code (these
+        # are not stealthy, so are not used if there is a conflict)
+        if '_value' in enum_class.__dict__:
+            for name in ('name', 'value'):
+                if name not in enums_by_name and name not in others:
+                    setattr(enum_class, name, property(attrgetter('_' + name)))
+
+        if not isinstance(enum_class, BnumLookupMeta):
+            for name, enum_item in enums_by_name.items():
+                setattr(enum_class, name, enum_item)
+
+        # secondary indexes declared in the class body (see bnum.indexes)
+        enum_class._indexes = tuple(value for value in others.values()
+                                    if isinstance(value, Index))
+        for index in enum_class._indexes:
+            index._bind(enum_class)
+
+        if hooks:
+            emit(hooks, CLASS_FINISHED, qualname, start=class_start)
+
         return enum_class
 
+    @staticmethod
+    def _create_member(enum_class, name, value, obj_type, __new__, use_args):
+        '''
+        Construct a single instance (which is not added to the class).
+        '''
+        # again, trust Enum...
+        if not isinstance(value, tuple):
+            args = (value, )
+        else:
+            args = value
+        if obj_type is tuple:   # special case for tuple enums
+            args = (args, )     # wrap it one more time
+        if not use_args:
+            enum_item = __new__(enum_class)
+            enum_item._value = value
+        else:
+            enum_item = __new__(enum_class, *args)
+            if not hasattr(enum_item, '_value'):
+                enum_item._value = obj_type(*args)
+        enum_item._name = name
+        enum_item.__init__(*args)
+        return enum_item
+
+    @staticmethod
+    def _can_be_attributes(enum_dict, bases, others):
+        '''
+        Instances can be class attributes only if they do not hide (or are
+        not hidden by) anything else, like the name and value properties.
+        '''
+        hidden = set(others)
+        for parent in bases:
+            for base in parent.__mro__:
+                hidden.update(base.__dict__)
+        return hidden.isdisjoint(enum_dict)
+
+    @classmethod
+    def _lookup_metaclass(metacls):
+        '''
+        The metaclass extended with BnumLookupMeta (which provides
+        __getattr__, and so slows all access to class attributes).
+        '''
+        if issubclass(metacls, BnumLookupMeta):
+            return metacls
+        cached = LOOKUP_METACLASSES.get((metacls, ))
+        if cached is not None:
+            return cached[0]
+        lookup = type('Lookup' + metacls.__name__, (BnumLookupMeta, metacls), {})
+        LOOKUP_METACLASSES.set((metacls, ), (lookup, ))
+        return lookup
+
     @staticmethod
     def _split_class_contents(classdict):
-        enums, others = OrderedDict(), dict()
-        for (name, value) in classdict.items():
-            if dunder(name) or hasattr(value, '__get__'):
-                others[name] = value
-            else:
-                enums[name] = value
+        '''
+        Separate instances from other class contents (dunder names and
+        descriptors, like methods).  Only values whose type (or, for
+        classes, the value itself) may be a descriptor are checked, since
+        most values share a few types.
+        '''
+        # (dict.values, since BnumDict has a values attribute)
+        kinds = set(map(type, dict.values(classdict)))
+        special = {kind for kind in kinds
+                   if issubclass(kind, type) or hasattr(kind, '__get__')}
+        hidden = [name for name, value in classdict.items()
+                  if name[:2] == '__' and dunder(name) or
+                  type(value) in special and hasattr(value, '__get__')]
+        enums = dict(classdict)
+        others = {name: enums.pop(name) for name in hidden}
         return enums, others
 
-    def __call__(cls, value=None, name=None):
-        if type(value) is cls:
+    def __call__(cls, value=None, name=None, **kwargs):
+        '''
+        Retrieve an instance by value and/or name.  Alternatively, if the
+        class has no instances, create a new class (see _create, which takes
+        the keyword arguments).
+        '''
+        # keyword arguments are collected (rather than listed) so that
+        # lookup does not fill in their defaults on every call
+        if kwargs and cls._enums_by_name:
+            raise TypeError('%s() got an unexpected keyword argument %r' %
+                            (cls.__name__, next(iter(kwargs))))
+        if value.__class__ is cls:
             if name is None or name == value.name:
                 return value
         elif value is None:
@@ -200,13 +475,23 @@ class BnumMeta(type):
             elif name in cls._enums_by_name:
                 return cls._enums_by_name[name]
             else:
-                print(cls._enums_by_name)
                 raise ValueError('No name %r' % name)
         elif name is None:
-            if value in cls._enums_by_value:
+            # a single probe (testing with "in" first would hash twice)
+            try:
                 return cls._enums_by_value[value]
-            else:
-                raise ValueError('No value %r' % value)
+            except KeyError:
+                pass
+            if cls._missing_hook is not None:
+                enum = cls._find_missing(value)
+                if enum is not None:
+                    return enum
+            raise ValueError('No value %r' % value)
+        elif not cls._enums_by_name:
+            if not isinstance(value, str):
+                raise ValueError('Class name must be a string, not %r' %
+                                 (value, ))
+            return cls._create(value, name, **kwargs)
         elif name in cls._enums_by_name:
             enum = cls._enums_by_name[name]
             if value in cls._enums_by_value and \
@@ -215,41 +500,224 @@ class BnumMeta(type):
         raise ValueError('Inconsistent name (%r) and value (%r)' %
                         (name, value))
 
-    # def __contains__(cls, enum_item):
-    #     return isinstance(enum_item, cls) and enum_item.name in cls._enum_map
+    def get(cls, value=None, name=None, default=None):
+        '''
+        Retrieve an instance by value and/or name, as calling the class, but
+        return default (instead of raising ValueError) if there is no match.
+        Unknown values are passed to _missing_ (if the class defines it).
+        '''
+        if name is None:
+            if value is None:
+                return default
+            elif value.__class__ is cls:
+                return value
+            try:
+                enum = cls._enums_by_value.get(value)
+            except TypeError:  # unhashable
+                enum = None
+            if enum is None and cls._missing_hook is not None:
+                enum = cls._find_missing(value)
+        else:
+            enum = cls._enums_by_name.get(name)
+            if enum is not None and value is not None and value is not enum:
+                try:
+                    if cls._enums_by_value.get(value) is not enum:
+                        enum = None
+                except TypeError:
+                    enum = None
+        return default if enum is None else enum
+
+    def _find_missing(cls, value):
+        '''
+        Call _missing_ for an unknown value, remembering the result (an
+        instance or None) if the class was created with missing_cache (the
+        oldest result is forgotten when the cache is full).
+        '''
+        cache = cls._missing_cache
+        if cache is not None:
+            try:
+                enum = cache.get(value, NOT_CACHED)
+            except TypeError:  # unhashable
+                cache = None
+            else:
+                if enum is not NOT_CACHED:
+                    return enum
+        enum = cls._missing_hook(value)
+        if enum is not None and enum.__class__ is not cls:
+            raise TypeError('_missing_ returned %r, not a %s' %
+                            (enum, cls.__name__))
+        if cache is not None:
+            if len(cache) >= cls._missing_cache_size:
+                # lookups may run in parallel, so another thread may have
+                # removed the oldest entry, or be changing the cache
+                try:
+                    cache.pop(next(iter(cache), None), None)
+                except RuntimeError:  # changed size during iteration
+                    pass
+            cache[value] = enum
+        return enum
+
+    def _create(cls, class_name, members, module=None, qualname=None,
+                type=None, values=None, allow_aliases=False,
+                fast_attributes=False, slots=False, ordered=False,
+                missing_cache=0):
+        '''
+        Create a new Bnum class, as a subclass of this one, without
+        evaluating a class body (the "functional" API).
+
+        members can be a string (names separated by commas and/or spaces),
+        an iterable of names, an iterable of (name, value) pairs, or a mapping
+        from names to values.  Names without values are given values by
+        `values` (as for the class form, so the default is the name).
+
+        type is an optional mixin type; the module is used for pickling (by
+        default, it is the module of the caller).
+        '''
+        if isinstance(members, str):
+            members = members.replace(',', ' ').split()
+        if isinstance(members, Mapping):
+            members = members.items()
+        implicit = values() if values else names()
+        classdict = {}
+        for item in members:
+            if isinstance(item, str):
+                name, value = item, implicit(item)
+            else:
+                name, value = item
+            if name in classdict:
+                raise TypeError('Attempted to reuse name: %r' % name)
+            classdict[name] = value
+        if module is None:
+            try:
+                module = sys._getframe(2).f_globals['__name__']
+            except (AttributeError, ValueError, KeyError):
+                pass
+        if module is not None:
+            classdict['__module__'] = module
+        classdict['__qualname__'] = class_name if qualname is None else qualname
+        bases = (cls, ) if type is None else (type, cls)
+        return cls.__class__(class_name, bases, classdict, values=values,
+                             allow_aliases=allow_aliases,
+                             fast_attributes=fast_attributes, slots=slots,
+                             ordered=ordered, missing_cache=missing_cache)
+
+    def __contains__(cls, enum_item):
+        '''
+        True if enum_item is an instance of the class (a dict lookup, rather
+        than a scan of the instances).  Use has_value or has_name for values
+        and names.
+        '''
+        return enum_item.__class__ is cls and \
+            cls._enums_by_name.get(enum_item._name) is enum_item
+
+    def has_value(cls, value):
+        '''True if there is an instance with the given value.'''
+        try:
+            return value in cls._enums_by_value
+        except TypeError:  # unhashable
+            return False
+
+    def has_name(cls, name):
+        '''True if there is an instance (or alias) with the given name.'''
+        try:
+            return name in cls._enums_by_name
+        except TypeError:  # unhashable
+            return False
 
     def __dir__(self):
         return ['__class__', '__doc__', '__members__'] + list(self._enums_by_name.keys())
 
     @property
     def __members__(cls):
-        return MappingProxyType(cls._enums_by_name)
+        return cls._members_proxy
 
-    def __getattr__(cls, name):
-        """Return the enum member matching `name`
+    def __getitem__(cls, name):
+        '''Retrieve an instance by name or (given an integer) by ordinal.'''
+        if isinstance(name, str):
+            return cls._enums_by_name[name]
+        return cls._members[name]
 
-        We use __getattr__ instead of descriptors or inserting into the enum
-        class' __dict__ in order to support `name` and `value` being both
-        properties for enum members (which live in the class' __dict__) and
-        enum members themselves.
+    def from_values(cls, values):
+        '''
+        Return a NumPy array of the ordinals (positions in value order) of
+        the instances with the given values, which can be a NumPy array or
+        anything that supports the buffer protocol.  Raises ValueError if any
+        value is unknown.
+        '''
+        from bnum.arrays import from_values
+        return from_values(cls, values)
 
-        """
+    def isin(cls, values):
+        '''
+        Return a NumPy boolean array that is true where the given values
+        (as for from_values) correspond to an instance.
+        '''
+        from bnum.arrays import isin
+        return isin(cls, values)
 
-        if dunder(name):
-            raise AttributeError(name)
-        try:
-            return cls._enums_by_name[name]
-        except KeyError:
-            raise AttributeError(name) from None
+    def parse(cls, text, prefix=True):
+        '''
+        Retrieve an instance by name from (untrusted) text, ignoring case and
+        whitespace and (if prefix is true) accepting a unique prefix.  Raises
+        ValueError if nothing matches and bnum.parsing.AmbiguousName (a
+        ValueError) if several instances match.
+        '''
+        return (cls._parse_index or parse_index(cls)).parse(text, prefix)
 
-    def __getitem__(cls, name):
-        return cls._enums_by_name[name]
+    def range(cls, low=None, high=None):
+        '''
+        Return a tuple of the instances with values from low (inclusive) to
+        high (exclusive), in value order.  Either limit can be None.  Raises
+        TypeError if the values cannot be ordered.
+        '''
+        return (cls._value_order or value_order(cls)).range(low, high)
+
+    def floor(cls, value, default=None):
+        '''Return the instance with the largest value <= value, or default.'''
+        return (cls._value_order or value_order(cls)).floor(value, default)
+
+    def ceil(cls, value, default=None):
+        '''Return the instance with the smallest value >= value, or default.'''
+        return (cls._value_order or value_order(cls)).ceil(value, default)
+
+    def nearest(cls, value, default=None):
+        '''
+        Return the instance with the value closest to value (the lower, if
+        two are equally close), or default if the class has no instances.
+        Values must support subtraction.
+        '''
+        return (cls._value_order or value_order(cls)).nearest(value, default)
+
+    def locate(cls, values, how='floor'):
+        '''
+        Return a NumPy array of the ordinals of the instances found by floor,
+        ceil or nearest (given by how) for each of the given values, with -1
+        where there is no instance.
+        '''
+        from bnum.arrays import locate
+        return locate(cls, values, how=how)
+
+    def decode_iter(cls, iterable, on_missing='raise', default=None,
+                    by_name=False, batch_size=1024):
+        '''
+        Return an iterator over the instances for the values (or names) in
+        iterable.  on_missing is 'raise' (ValueError), 'skip', 'collect' (skip,
+        but record index and value in the iterator's missing list) or
+        'default' (replace with default).  The iterator's misses attribute
+        is a Counter of unknown values.  See bnum.stream.
+        '''
+        return DecodeIter(cls, iterable, on_missing=on_missing,
+                          default=default, by_name=by_name,
+                          batch_size=batch_size)
 
     def __iter__(cls):
-        return (cls._enums_by_value[value] for value in cls._enums_by_value)
+        return iter(cls._members)
+
+    def __reversed__(cls):
+        return reversed(cls._members)
 
     def __len__(cls):
-        return len(cls._enums_by_name)
+        return len(cls._members)
 
     # def __repr__(cls):
     #     return "<enum %r>" % cls.__name__
@@ -266,8 +734,9 @@ class BnumMeta(type):
             return object, Bnum
 
         # double check that we are not subclassing a class with existing
-        # enumeration members; while we're at it, see if any other data
-        # type has been mixed in so we can use the correct __new__
+        # enumeration members (checked each time, since open classes can
+        # gain members); while we're at it, see if any other data type has
+        # been mixed in so we can use the correct __new__
         obj_type = first_enum = None
         for base in bases:
             if  base not in (Bnum, ImplicitBnum, ExplicitBnum) \
@@ -275,6 +744,9 @@ class BnumMeta(type):
                     and base._enums_by_name:
                 raise TypeError("Cannot extend enumerations")
             # base is now the last base in bases
+        cached = MIXINS.get(bases)
+        if cached is not None:
+            return cached
         if not issubclass(base, Bnum):
             raise TypeError("new enumerations must be created as "
                             "`ClassName([mixin_type,] enum_type)`")
@@ -293,6 +765,8 @@ class BnumMeta(type):
                     if obj_type is None:
                         obj_type = base
 
+        if Bnum is not None:
+            MIXINS.set(bases, (obj_type, first_enum))
         return obj_type, first_enum
 
     @staticmethod
@@ -312,6 +786,11 @@ class BnumMeta(type):
         # should __new__ be saved as __new_member__ later?
         save_new = __new__ is not None
 
+        if not save_new:
+            cached = NEW_METHODS.get((obj_type, first_enum))
+            if cached is not None:
+                return cached
+
         if __new__ is None:
             # check all possibles for __new_member__ before falling back to
             # __new__
@@ -339,14 +818,92 @@ class BnumMeta(type):
         else:
             use_args = True
 
+        if not save_new and Bnum is not None:
+            NEW_METHODS.set((obj_type, first_enum), (__new__, save_new, use_args))
         return __new__, save_new, use_args
 
 
+class BnumLookupMeta(type):
+    '''
+    Provides __getattr__ for Bnum classes whose instances are not class
+    attributes (see BnumMeta._lookup_metaclass).  This is a separate class
+    because defining __getattr__ on a metaclass makes all class attribute
+    access slower (even when the attribute exists).
+    '''
+
+    def __getattr__(cls, name):
+        """Return the enum member matching `name`
+
+        We use __getattr__ instead of descriptors or inserting into the enum
+        class' __dict__ in order to support `name` and `value` being both
+        properties for enum members (which live in the class' __dict__) and
+        enum members themselves.
+
+        """
+
+        if dunder(name):
+            raise AttributeError(name)
+        try:
+            return cls._enums_by_name[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _weak(item):
+    try:
+        return ref(item)
+    except TypeError:  # bool, etc
+        return item
+
+
+class ClassCache:
+    '''
+    A cache keyed by tuples of classes, which does not keep the classes
+    alive (so classes created at runtime, eg by _create, can be collected).
+    The items of the cached tuples are also held weakly where possible,
+    since they are usually the classes in the key, or their methods.  An
+    entry is dropped when a class in its key is collected.
+    '''
+
+    def __init__(self):
+        self.entries = {}
+
+    def _drop(self, dead):
+        for key in [key for key in self.entries if dead in key]:
+            del self.entries[key]
+
+    def get(self, classes):
+        '''The tuple cached for the classes, or None.'''
+        items = self.entries.get(tuple(map(ref, classes)))
+        if items is not None:
+            items = tuple(item() if isinstance(item, ref) else item
+                          for item in items)
+            if None not in items:  # (None if an item has been collected)
+                return items
+        return None
+
+    def set(self, classes, items):
+        '''Cache a tuple (which must not contain None) for the classes.'''
+        key = tuple(ref(cls, self._drop) for cls in classes)
+        self.entries[key] = tuple(map(_weak, items))
+
+
+# cache of subclasses of BnumMeta extended with BnumLookupMeta
+LOOKUP_METACLASSES = ClassCache()
+
+# caches of BnumMeta._get_mixins (by bases, which have no instances) and
+# BnumMeta._find_new (by mixin type and first enum, when the class does not
+# define __new__), since most classes share a few bases
+MIXINS = ClassCache()
+NEW_METHODS = ClassCache()
+
+
 class ImplicitBnumMeta(BnumMeta):
 
     @classmethod
     def __prepare__(metacls, cls, bases,
-                values=None, allow_aliases=False):
+                values=None, allow_aliases=False, fast_attributes=False,
+                slots=False, ordered=False, missing_cache=0):
         return BnumDict(implicit=True, values=values() if values else names())
 
 
@@ -354,7 +911,8 @@ class ExplicitBnumMeta(BnumMeta):
 
     @classmethod
     def __prepare__(metacls, cls, bases,
-                values=None, allow_aliases=False):
+                values=None, allow_aliases=False, fast_attributes=False,
+                slots=False, ordered=False, missing_cache=0):
         return BnumDict(implicit=False, values=values() if values else names())
 
 
@@ -363,6 +921,9 @@ class ExplicitBnumMeta(BnumMeta):
 class Bnum():
     """Valueless, unordered enumeration class"""
 
+    # empty, so that subclasses can choose slots (see BnumMeta)
+    __slots__ = ()
+
     # no actual assignments are made as it is a chicken-and-egg problem
     # with the metaclass, which checks for the Enum class specifically
 
@@ -397,16 +958,28 @@ class Bnum():
     def __dir__(self):
         return (['__class__', '__doc__', 'name', 'value'])
 
-    def __eq__(self, other):
-        if type(other) is self.__class__:
-            return self is other
-        return NotImplemented
+    # instances are unique, so equality is identity.  the object methods are
+    # implemented in C, and the hash is fixed when the instance is created
+    # (calling a python __hash__ method is slower than a dict lookup).  mixin
+    # types (int, str, etc) provide their own, which precede these in the mro.
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
 
     def __getnewargs__(self):
         return (self._value, )
 
-    def __hash__(self):
-        return hash(self._name)
+    @classmethod
+    def _missing_(cls, value):
+        '''
+        Called (by calling the class, or get) with a value that has no
+        instance.  Subclasses can return an instance (eg for an alternative
+        spelling), or None.
+        '''
+        return None
+
+    def __reduce_ex__(self, protocol):
+        return _resolve_instance, (self.__class__, self._name)
 
     @_StealthProperty
     def name(self):
@@ -417,13 +990,17 @@ class Bnum():
         return self._value
 
 
+# the default Bnum._missing_ (classes that do not replace it skip the call)
+MISSING = Bnum._missing_.__func__
+
+
 class ImplicitBnum(Bnum, metaclass=ImplicitBnumMeta):
 
-    pass
+    __slots__ = ()
 
 
 class ExplicitBnum(Bnum, metaclass=ExplicitBnumMeta):
 
-    pass
+    __slots__ = ()
 
 
@@ -0,0 +1,300 @@
+
+from operator import index
+
+import numpy as np
+
+'''
+Vectorized (NumPy) support for Bnum classes.
+
+This module imports NumPy, but bnum only imports this module when one of
+these functions is used (from_values, isin, locate), so NumPy remains an
+optional dependency of bnum itself.
+'''
+
+
+# dense integer tables are used when the values span no more than this
+# multiple of the number of instances (or this many slots for small enums)
+DENSE_FACTOR = 4
+DENSE_MINIMUM = 1024
+
+INT64 = np.iinfo(np.int64)
+
+ORDINAL_DTYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+class ValueTable:
+    '''
+    Lookup tables, derived from `_enums_by_value`, that map arrays of values
+    to ordinals (positions in value order) in a single vectorized pass.
+    Missing values map to -1.
+
+    Three strategies are used, in order of preference:
+    - a dense table indexed by (value - lowest) for compact integer values;
+    - a sorted array of values searched with numpy.searchsorted;
+    - a dictionary lookup per value (for values NumPy cannot compare).
+    '''
+
+    def __init__(self, cls):
+        self.by_value = dict((value, enum_item._ordinal)
+                             for value, enum_item in cls._enums_by_value.items())
+        values = list(self.by_value)
+        self.dense = self.keys = None
+        if values and all(type(value) is int for value in values):
+            self.low, high = min(values), max(values)
+            span = high - self.low + 1
+            if span <= max(DENSE_FACTOR * len(values), DENSE_MINIMUM) \
+                    and INT64.min <= self.low and high <= INT64.max:
+                self.dense = np.full(span, -1, dtype=np.intp)
+                self.dense[[value - self.low for value in values]] = \
+                    list(self.by_value.values())
+        if self.dense is None and values:
+            try:
+                keys = np.array(values)
+                if keys.dtype != object and keys.shape == (len(values),):
+                    order = np.argsort(keys, kind='stable')
+                    self.keys = keys[order]
+                    self.sorted_ordinals = np.array(
+                        [self.by_value[values[i]] for i in order],
+                        dtype=np.intp)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        self.members = cls._members
+        self.columns = {}
+
+    def column(self, name):
+        '''An array of the given attribute for each instance, in ordinal order.'''
+        column = self.columns.get(name)
+        if column is None:
+            items = [getattr(enum_item, name) for enum_item in self.members]
+            # avoid NumPy converting mixed types to a common type (eg strings)
+            mixed = len(set(map(type, items))) > 1
+            column = np.array(items, dtype=object if mixed else None)
+            self.columns[name] = column
+        return column
+
+    def ordinals(self, values):
+        '''Map an array of values to ordinals, with -1 for missing values.'''
+        if self.dense is not None and (values.dtype.kind in 'ib' or
+                (values.dtype.kind == 'u' and values.dtype.itemsize < 8)):
+            return self._dense(values)
+        elif self.keys is not None:
+            try:
+                return self._sorted(values)
+            except TypeError:
+                pass
+        return self._generic(values)
+
+    def _dense(self, values):
+        offsets = values.astype(np.int64, copy=False) - self.low
+        known = (offsets >= 0) & (offsets < len(self.dense))
+        result = np.full(values.shape, -1, dtype=np.intp)
+        result[known] = self.dense[offsets[known]]
+        return result
+
+    def _sorted(self, values):
+        if len(self.keys) == 0:
+            return np.full(values.shape, -1, dtype=np.intp)
+        positions = np.searchsorted(self.keys, values)
+        np.minimum(positions, len(self.keys) - 1, out=positions)
+        found = self.keys[positions] == values
+        if not isinstance(found, np.ndarray):  # incomparable types
+            return np.full(values.shape, -1, dtype=np.intp)
+        return np.where(found, self.sorted_ordinals[positions], -1)
+
+    def _generic(self, values):
+        lookup = self.by_value.get
+        def ordinal(value):
+            try:
+                return lookup(value, -1)
+            except TypeError:  # unhashable
+                return -1
+        return np.frompyfunc(ordinal, 1, 1)(values).astype(np.intp)
+
+
+def value_table(cls):
+    '''Return the (cached) ValueTable for a class.'''
+    table = cls.__dict__.get('_value_table')
+    if table is None:
+        table = ValueTable(cls)
+        cls._value_table = table
+    return table
+
+
+def as_array(values):
+    '''Convert the argument to an array (bytes are treated as uint8).'''
+    if isinstance(values, (bytes, bytearray)):
+        return np.frombuffer(values, dtype=np.uint8)
+    return np.asarray(values)
+
+
+def ordinals(cls, values):
+    '''Return the ordinals of the given values, using -1 for missing values.'''
+    return value_table(cls).ordinals(as_array(values))
+
+
+def from_values(cls, values):
+    '''
+    Return the ordinals of the instances with the given values.  Raises
+    ValueError if any value is unknown.
+    '''
+    values = as_array(values)
+    result = value_table(cls).ordinals(values)
+    missing = np.flatnonzero(result < 0)
+    if len(missing):
+        first = index(missing[0])
+        raise ValueError('No value %r' % values.ravel()[first:first+1].tolist()[0])
+    return result
+
+
+def isin(cls, values):
+    '''Return a boolean array that is true for known values.'''
+    return ordinals(cls, values) >= 0
+
+
+def locate(cls, values, how='floor'):
+    '''
+    Return the ordinals of the instances found by floor, ceil or nearest
+    (see bnum.ranges) for each value, using -1 where there is no instance
+    (or the value is nan).
+    '''
+    from bnum.ranges import value_order
+    if how not in ('floor', 'ceil', 'nearest'):
+        raise ValueError('Unknown method %r' % how)
+    order = value_order(cls)
+    if order.arrays is None:
+        order.arrays = (np.array(order.values),
+                        np.array([enum_item._ordinal for enum_item in order.members],
+                                 dtype=np.intp))
+    keys, ordinals = order.arrays
+    values = as_array(values)
+    if not len(keys):
+        return np.full(values.shape, -1, dtype=np.intp)
+    if how == 'floor':
+        positions = np.searchsorted(keys, values, side='right') - 1
+        found = positions >= 0
+    else:
+        positions = np.searchsorted(keys, values, side='left')
+        found = positions < len(keys)
+        if how == 'nearest':
+            lower = np.maximum(positions - 1, 0)
+            upper = np.minimum(positions, len(keys) - 1)
+            # the lower value if closer (or equally close, or above the end)
+            use_lower = (positions > 0) & \
+                ((positions == len(keys)) |
+                 (values - keys[lower] <= keys[upper] - values))
+            positions = np.where(use_lower, lower, upper)
+            found = np.ones(positions.shape, dtype=bool)
+    if values.dtype.kind in 'fc':
+        found &= values == values  # nan
+    return np.where(found, ordinals[np.clip(positions, 0, len(keys) - 1)], -1)
+
+
+def ordinal_dtype(cls):
+    '''The smallest unsigned integer type that can hold the class's ordinals.'''
+    for dtype in ORDINAL_DTYPES:
+        if len(cls._members) <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    raise ValueError('Too many instances in %s' % cls.__name__)
+
+
+class BnumArray:
+    '''
+    An array of instances of a single Bnum class, stored as a NumPy array of
+    ordinals using the smallest unsigned integer type that fits (so one byte
+    per element for up to 256 instances).
+
+    Comparison with an instance, isin() and gathering values are vectorized;
+    slicing returns a view (as for NumPy); the ordinals are available through
+    the array and buffer protocols.
+    '''
+
+    def __init__(self, cls, members=()):
+        def ordinal(member):
+            if type(member) is not cls:
+                raise TypeError('%r is not a %s' % (member, cls.__name__))
+            return member._ordinal
+        self.cls = cls
+        self.ordinals = np.fromiter(map(ordinal, members),
+                                    dtype=ordinal_dtype(cls))
+
+    @classmethod
+    def from_ordinals(cls, bnum, ordinals):
+        '''Create an array from ordinals (no copy if the type is correct).'''
+        ordinals = np.asarray(ordinals)
+        if len(ordinals) and (ordinals.min() < 0 or ordinals.max() >= len(bnum)):
+            raise IndexError('Ordinal out of range for %s' % bnum.__name__)
+        instance = cls.__new__(cls)
+        instance.cls = bnum
+        instance.ordinals = ordinals.astype(ordinal_dtype(bnum), copy=False)
+        return instance
+
+    @classmethod
+    def from_values(cls, bnum, values):
+        '''Create an array from values (see from_values()).'''
+        return cls.from_ordinals(bnum, from_values(bnum, values))
+
+    def _ordinal(self, member):
+        if type(member) is not self.cls:
+            raise TypeError('%r is not a %s' % (member, self.cls.__name__))
+        return member._ordinal
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __getitem__(self, key):
+        ordinals = self.ordinals[key]
+        if isinstance(ordinals, np.ndarray):
+            return self.from_ordinals(self.cls, ordinals)
+        return self.cls._members[ordinals]
+
+    def __setitem__(self, key, members):
+        if isinstance(members, BnumArray) and members.cls is self.cls:
+            self.ordinals[key] = members.ordinals
+        elif isinstance(members, self.cls):
+            self.ordinals[key] = self._ordinal(members)
+        else:
+            self.ordinals[key] = [self._ordinal(member) for member in members]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, BnumArray) and other.cls is self.cls:
+            return self.ordinals == other.ordinals
+        if type(other) is self.cls:
+            return self.ordinals == other._ordinal
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else ~equal
+
+    __hash__ = None
+
+    def isin(self, members):
+        '''A boolean array that is true where the instance is in members.'''
+        table = np.zeros(len(self.cls._members), dtype=bool)
+        table[[member._ordinal for member in members
+               if type(member) is self.cls]] = True
+        return table[self.ordinals]
+
+    def gather(self, name='value'):
+        '''An array of the given attribute (by default, value) of each instance.'''
+        return value_table(self.cls).column(name)[self.ordinals]
+
+    def tolist(self):
+        '''A list of the instances.'''
+        return list(map(self.cls._members.__getitem__, self.ordinals.tolist()))
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.ordinals, dtype=dtype)
+        return self.ordinals if dtype is None else \
+            self.ordinals.astype(dtype, copy=False)
+
+    def __buffer__(self, flags):  # python 3.12+ (PEP 688)
+        return memoryview(self.ordinals)
+
+    def __repr__(self):
+        return '%s(%s, %r)' % (self.__class__.__name__, self.cls.__name__,
+                               self.tolist())
@@ -0,0 +1,306 @@
+
+from array import array
+from ast import literal_eval
+from collections.abc import Mapping, Sequence
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from types import MappingProxyType
+
+from bnum import Bnum, BnumDict, BnumMeta, BnumLookupMeta, ILLEGAL_NAMES
+from enum import dunder
+
+'''
+Bnum classes whose instances are listed in a catalog file, which is memory
+mapped, and constructed only when first used.  This avoids the cost (time and
+memory) of constructing every instance of very large enumerations (product
+codes, etc) when they are defined.
+
+A catalog is written with write_catalog():
+
+    >>> write_catalog('skus.bnum', (('widget', 1001), ('gadget', 1002)))
+
+and used by giving the path when the class is defined:
+
+    >>> class Sku(CatalogBnum, catalog='skus.bnum'):
+    ...     def describe(self): return 'SKU %d' % self.value
+    ...
+    >>> Sku.widget.describe()
+    'SKU 1001'
+
+Lookup by name is a binary search over an index sorted by name; lookup by
+value is a binary search over the instances (which are stored in value order)
+if the values could be sorted, or a linear scan if not.  Either way,
+instances are constructed at most once, so identity is preserved.
+'''
+
+
+MAGIC = b'BNUMCAT1'
+
+# magic, number of instances, bytes per record, whether values are sorted
+HEADER = Struct('<8sQQ?')
+
+# the index of ordinals sorted by name (native byte order)
+INDEX_TYPE = 'I'
+
+# names that cannot be used for instances in a catalog (they would be hidden
+# by methods of the class)
+RESERVED_NAMES = ILLEGAL_NAMES | {'_materialize'}
+
+
+def write_catalog(path, items):
+    '''
+    Write a catalog file from names, (name, value) pairs, or a mapping.  If
+    only names are given then the values are the names (as for Bnum).  Values
+    must be Python literals (strings, numbers, tuples, etc).
+
+    As for Bnum classes, instances are stored in value order (if the values
+    can be sorted), and duplicate values and reserved names (see the README)
+    are an error.
+    '''
+    if isinstance(items, Mapping):
+        items = items.items()
+    records, names, values = [], set(), set()
+    for item in items:
+        name, value = (item, item) if isinstance(item, str) else item
+        if name in names:
+            raise ValueError('Duplicate name %s' % name)
+        if value in values:
+            raise ValueError('Duplicate value for %s' % name)
+        names.add(name)
+        values.add(value)
+        encoded = name.encode('utf8'), repr(value).encode('utf8')
+        if any(b'\0' in text for text in encoded):
+            raise ValueError('Null byte in %r' % name)
+        records.append((value, b'\0'.join(encoded)))
+    reserved = sorted(name for name in names
+                      if name in RESERVED_NAMES or dunder(name))
+    if reserved:
+        raise ValueError('Enumeration names cannot include %s (used by the '
+                         'class)' % ', '.join(reserved))
+    try:
+        records = sorted(records, key=lambda record: record[0])
+        is_sorted = True
+    except TypeError:
+        is_sorted = False
+    width = max((len(record) for (_, record) in records), default=0)
+    index = array(INDEX_TYPE, sorted(range(len(records)),
+                                     key=lambda i: records[i][1].partition(b'\0')[0]))
+    with open(path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, len(records), width, is_sorted))
+        for _, record in records:
+            output.write(record.ljust(width, b'\0'))
+        output.write(index.tobytes())
+
+
+class Catalog:
+    '''
+    A memory-mapped catalog file.  Instances are identified by ordinal (their
+    position in the file, which is value order).
+    '''
+
+    def __init__(self, path):
+        with open(path, 'rb') as input:
+            self.map = mmap(input.fileno(), 0, access=ACCESS_READ)
+        magic, self.count, self.width, self.sorted = \
+            HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError('%s is not a catalog' % path)
+        self.start = HEADER.size
+        index_start = self.start + self.count * self.width
+        self.index = memoryview(self.map)[index_start:].cast(INDEX_TYPE)
+        # decoded values, by ordinal, for the records read by find_value
+        # (each is decoded at most once), and the ordinals of values found
+        self.values = {}
+        self.ordinals = {}
+
+    def __len__(self):
+        return self.count
+
+    def raw_name(self, ordinal):
+        '''The (encoded) name for the given ordinal, without the value.'''
+        start = self.start + ordinal * self.width
+        return self.map[start:self.map.find(b'\0', start, start + self.width)]
+
+    def entry(self, ordinal):
+        '''The name and value for the given ordinal.'''
+        if not 0 <= ordinal < self.count:
+            raise IndexError(ordinal)
+        start = self.start + ordinal * self.width
+        name, _, value = self.map[start:start + self.width].rstrip(b'\0')\
+            .partition(b'\0')
+        return name.decode('utf8'), literal_eval(value.decode('utf8'))
+
+    def find_name(self, name):
+        '''The ordinal for the given name, or -1.'''
+        if not isinstance(name, str):
+            return -1
+        target = name.encode('utf8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.raw_name(self.index[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.raw_name(self.index[low]) == target:
+            return self.index[low]
+        return -1
+
+    def value(self, ordinal):
+        '''The value for the given ordinal (decoded once, then remembered).'''
+        try:
+            return self.values[ordinal]
+        except KeyError:
+            value = self.values[ordinal] = self.entry(ordinal)[1]
+            return value
+
+    def find_value(self, value):
+        '''The ordinal for the given value, or -1.'''
+        try:
+            return self.ordinals[value]
+        except (KeyError, TypeError):  # not found before, or unhashable
+            pass
+        ordinal = -1
+        try:
+            if self.sorted:
+                low, high = 0, self.count
+                while low < high:
+                    middle = (low + high) // 2
+                    if self.value(middle) < value:
+                        low = middle + 1
+                    else:
+                        high = middle
+                if low < self.count and self.value(low) == value:
+                    ordinal = low
+            else:
+                for candidate in range(self.count):
+                    if self.value(candidate) == value:
+                        ordinal = candidate
+                        break
+        except TypeError:  # incomparable value
+            pass
+        if ordinal >= 0:
+            try:
+                self.ordinals[value] = ordinal
+            except TypeError:
+                pass
+        return ordinal
+
+
+class CatalogMembers(Sequence):
+    '''Stands in for _members, constructing instances as needed.'''
+
+    def __init__(self, cls):
+        self.cls = cls
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return tuple(self[i] for i in range(*ordinal.indices(len(self))))
+        if ordinal < 0:
+            ordinal += len(self)
+        return self.cls._materialize(ordinal)
+
+    def __len__(self):
+        return len(self.cls._catalog)
+
+
+class CatalogNames(Mapping):
+    '''Stands in for _enums_by_name, constructing instances as needed.'''
+
+    def __init__(self, cls):
+        self.cls = cls
+
+    def __getitem__(self, name):
+        ordinal = self.cls._catalog.find_name(name)
+        if ordinal < 0:
+            raise KeyError(name)
+        return self.cls._materialize(ordinal)
+
+    def __contains__(self, name):
+        return self.cls._catalog.find_name(name) >= 0
+
+    def __iter__(self):
+        # only the names are read (values are not decoded)
+        catalog = self.cls._catalog
+        return (catalog.raw_name(ordinal).decode('utf8')
+                for ordinal in range(len(catalog)))
+
+    def __len__(self):
+        return len(self.cls._catalog)
+
+
+class CatalogValues(Mapping):
+    '''Stands in for _enums_by_value, constructing instances as needed.'''
+
+    def __init__(self, cls):
+        self.cls = cls
+
+    def __getitem__(self, value):
+        ordinal = self.cls._catalog.find_value(value)
+        if ordinal < 0:
+            raise KeyError(value)
+        return self.cls._materialize(ordinal)
+
+    def get(self, value, default=None):
+        '''The instance with the given value, or default (a single search).'''
+        ordinal = self.cls._catalog.find_value(value)
+        return default if ordinal < 0 else self.cls._materialize(ordinal)
+
+    def __contains__(self, value):
+        return self.cls._catalog.find_value(value) >= 0
+
+    def __iter__(self):
+        catalog = self.cls._catalog
+        return (catalog.entry(ordinal)[1] for ordinal in range(len(catalog)))
+
+    def __len__(self):
+        return len(self.cls._catalog)
+
+
+class CatalogBnumMeta(BnumLookupMeta, BnumMeta):
+    '''
+    Constructs classes whose instances are read from a catalog.  The lookup
+    tables used by BnumMeta are replaced by CatalogMembers, CatalogNames and
+    CatalogValues, which construct instances on first access.
+    '''
+
+    @classmethod
+    def __prepare__(metacls, cls, bases, catalog=None):
+        return BnumDict(implicit=False)
+
+    def __init__(metacls, cls, bases=None, dict=None, catalog=None):
+        super().__init__(cls, bases, dict)
+
+    def __new__(metacls, cls, bases, classdict, catalog=None):
+        obj_type, first_enum = metacls._get_mixins(bases)
+        __new__, save_new, use_args = \
+            metacls._find_new(classdict, obj_type, first_enum)
+        enum_class = super().__new__(metacls, cls, bases, classdict)
+        if enum_class._enums_by_name:
+            raise TypeError('Instances of %s must be in the catalog' % cls)
+        if catalog is not None:
+            enum_class._catalog = Catalog(catalog)
+            enum_class._materialized = {}
+            enum_class._factory = obj_type, __new__, use_args
+            enum_class._members = CatalogMembers(enum_class)
+            enum_class._enums_by_name = CatalogNames(enum_class)
+            enum_class._enums_by_value = CatalogValues(enum_class)
+            enum_class._members_proxy = \
+                MappingProxyType(enum_class._enums_by_name)
+        return enum_class
+
+    def _materialize(cls, ordinal):
+        '''Return the instance with the given ordinal, creating if needed.'''
+        try:
+            return cls._materialized[ordinal]
+        except KeyError:
+            name, value = cls._catalog.entry(ordinal)
+            enum_item = cls._create_member(cls, name, value, *cls._factory)
+            enum_item._ordinal = ordinal
+            # setdefault is atomic, so only one instance is ever returned
+            return cls._materialized.setdefault(ordinal, enum_item)
+
+
+class CatalogBnum(Bnum, metaclass=CatalogBnumMeta):
+
+    pass
@@ -0,0 +1,160 @@
+
+from collections import namedtuple
+from mmap import mmap, ACCESS_READ
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+'''
+Bulk decoding of a column of names (or values) from delimited text (CSV
+without quoting, etc) held in a buffer or memory mapped file.
+
+The text is processed in chunks (ending at a newline).  Within each chunk
+the delimiters are found, and the tokens in the chosen column copied to a
+fixed-width byte array, which is matched against the sorted names with
+numpy.searchsorted.  So no Python object is created per line.
+
+NumPy is required (as for bnum.arrays).
+'''
+
+
+NEWLINE, RETURN = ord(b'\n'), ord(b'\r')
+
+CHUNK_SIZE = 1 << 24
+
+SIGNED_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+# the first n bytes of a little-endian 64 bit integer
+LENGTH_MASKS = np.array([(1 << (8 * n)) - 1 for n in range(9)], dtype='<u8')
+
+# ordinals has one entry per line (-1 if unknown); unknown contains the byte
+# offsets (in the whole buffer) of the unknown tokens (or of the line, if the
+# column is missing)
+DecodedChunk = namedtuple('DecodedChunk', 'ordinals unknown')
+
+
+def signed_dtype(cls):
+    '''The smallest signed integer type that holds the ordinals and -1.'''
+    for dtype in SIGNED_DTYPES:
+        if len(cls._members) <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError('Too many instances in %s' % cls.__name__)
+
+
+class TokenTable:
+    '''
+    The encoded names (or str() of values) of a class, sorted, as a
+    fixed-width byte array, with the matching ordinals.  Tokens of up to 8
+    bytes are compared as 64 bit integers (which is faster).
+    '''
+
+    def __init__(self, cls, by_name=True, encoding='utf8'):
+        if by_name:
+            pairs = [(name.encode(encoding), enum_item._ordinal)
+                     for name, enum_item in cls._enums_by_name.items()]
+        else:
+            pairs = [(str(value).encode(encoding), enum_item._ordinal)
+                     for value, enum_item in cls._enums_by_value.items()]
+        self.width = max((len(token) for token, _ in pairs), default=1)
+        if self.width <= 8:
+            self.width, self.key_dtype = 8, np.dtype('<u8')
+        else:
+            self.key_dtype = np.dtype('S%d' % self.width)
+        tokens = np.array([token for token, _ in pairs],
+                          dtype='S%d' % self.width).view(self.key_dtype)
+        order = np.argsort(tokens, kind='stable')
+        self.tokens = tokens[order]
+        if len(self.tokens) and (self.tokens[1:] == self.tokens[:-1]).any():
+            raise ValueError('Duplicate token in %s' % cls.__name__)
+        self.ordinals = np.array([ordinal for _, ordinal in pairs],
+                                 dtype=signed_dtype(cls))[order]
+        self.dtype = self.ordinals.dtype
+
+    def match(self, data, starts, lengths):
+        '''Ordinals for the tokens at starts (with lengths) in data, or -1.'''
+        if not len(self.tokens) or not len(starts):
+            return np.full(len(starts), -1, dtype=self.dtype)
+        # copy width bytes from each start (padding so that none is short)
+        padded = np.concatenate((data, np.zeros(self.width, dtype=np.uint8)))
+        tokens = sliding_window_view(padded, self.width)[starts]
+        if self.key_dtype == np.dtype('<u8'):
+            # clear bytes past the end of each token with a mask
+            tokens = tokens.view(np.dtype('<u8')).ravel() & \
+                LENGTH_MASKS[np.minimum(lengths, 8)]
+        else:
+            tokens[np.arange(self.width) >= lengths[:, None]] = 0
+            tokens = tokens.view(self.key_dtype).ravel()
+        positions = np.searchsorted(self.tokens, tokens)
+        np.minimum(positions, len(self.tokens) - 1, out=positions)
+        found = (self.tokens[positions] == tokens) & (lengths <= self.width)
+        return np.where(found, self.ordinals[positions], -1).astype(self.dtype)
+
+
+def decode_chunk(table, data, base, column, delimiter):
+    '''
+    Decode data (a uint8 array of complete lines, the last ending with a
+    newline), which starts at byte base of the buffer.
+    '''
+    newlines = np.flatnonzero(data == NEWLINE)
+    delimiters = np.flatnonzero(data == delimiter)
+    line_starts = np.concatenate(([0], newlines[:-1] + 1))
+    # the index (in delimiters) of the first delimiter in each line
+    first = np.searchsorted(delimiters, line_starts)
+    # pad so that indices past the last delimiter give the end of the data
+    delimiters = np.concatenate((delimiters, [len(data)]))
+    if column:
+        before = delimiters[np.minimum(first + column - 1, len(delimiters) - 1)]
+        present = before < newlines
+        starts = np.where(present, before + 1, line_starts)
+    else:
+        present = np.ones(len(line_starts), dtype=bool)
+        starts = line_starts
+    after = delimiters[np.minimum(first + column, len(delimiters) - 1)]
+    ends = np.minimum(after, newlines)
+    # ignore the \r in \r\n
+    ends -= (ends == newlines) & (ends > starts) & (data[ends - 1] == RETURN)
+    ordinals = table.match(data, starts, ends - starts)
+    ordinals[~present] = -1
+    return DecodedChunk(ordinals, starts[ordinals < 0] + base)
+
+
+def decode_column(cls, buffer, column=0, delimiter=b',', by_name=True,
+                  encoding='utf8', chunk_size=CHUNK_SIZE):
+    '''
+    Decode the given column (counting from zero) of each line of delimited
+    text in buffer (bytes, mmap, or anything supporting the buffer protocol)
+    to ordinals.  The tokens are names or (with by_name=False) str(value).
+
+    This is a generator of DecodedChunk, each containing the ordinals (with
+    -1 for unknown tokens, one per line) for a chunk of (about) chunk_size
+    bytes, and the byte offsets of the unknown tokens.
+    '''
+    table = TokenTable(cls, by_name=by_name, encoding=encoding)
+    delimiter = ord(delimiter)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    start = 0
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        newlines = np.flatnonzero(data[start:end] == NEWLINE)
+        while not len(newlines) and end < len(data):
+            end = min(start + 2 * (end - start), len(data))
+            newlines = np.flatnonzero(data[start:end] == NEWLINE)
+        if end < len(data) or (len(newlines) and newlines[-1] == end - start - 1):
+            end = start + newlines[-1] + 1
+            chunk = data[start:end]
+        else:  # final line with no newline
+            chunk = np.concatenate((data[start:end], [NEWLINE])).astype(np.uint8)
+        yield decode_chunk(table, chunk, start, column, delimiter)
+        start = end
+
+
+def decode_file(cls, path, column=0, delimiter=b',', by_name=True,
+                encoding='utf8', chunk_size=CHUNK_SIZE):
+    '''As decode_column(), but for a file (which is memory mapped).'''
+    with open(path, 'rb') as input:
+        if not input.seek(0, 2):
+            return  # mmap cannot map an empty file
+        with mmap(input.fileno(), 0, access=ACCESS_READ) as buffer:
+            yield from decode_column(cls, buffer, column=column,
+                                     delimiter=delimiter, by_name=by_name,
+                                     encoding=encoding, chunk_size=chunk_size)
@@ -0,0 +1,307 @@
+
+from collections.abc import Mapping, MutableMapping, MutableSet
+
+'''
+Containers specialised for the instances of a single Bnum class, using the
+ordinal of each instance (its position in value order) instead of hashing.
+'''
+
+
+# marks an empty slot in BnumMap
+EMPTY = object()
+
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # before python 3.10
+    def popcount(mask):
+        return bin(mask).count('1')
+
+
+class BnumSet(MutableSet):
+    '''
+    A set of instances of a single Bnum class, stored as an integer bitmask
+    (bit n is set if the instance with ordinal n is present).  Union,
+    intersection, difference and comparison with another BnumSet for the
+    same class operate on the whole mask, so are much faster than for a set
+    of more than a few instances; iteration is in the class's value order.
+
+    Operations on single instances (membership, add, remove) and len() run
+    Python code, so are several times slower than for the built-in set (see
+    bench_set in bnum.tests.benchmark).
+    '''
+
+    __slots__ = ('_cls', '_mask')
+
+    def __init__(self, cls, members=()):
+        self._cls = cls
+        self._mask = 0
+        for member in members:
+            self.add(member)
+
+    @classmethod
+    def from_mask(cls, bnum, mask):
+        '''Create a set from a class and a mask (see mask).'''
+        instance = cls.__new__(cls)
+        instance._cls = bnum
+        instance._mask = mask
+        return instance
+
+    @property
+    def mask(self):
+        '''The bitmask (bit n is set if the instance with ordinal n is present).'''
+        return self._mask
+
+    def _from_iterable(self, members):
+        return self.__class__(self._cls, members)
+
+    def _bit(self, member):
+        if type(member) is not self._cls:
+            raise TypeError('%r is not a %s' % (member, self._cls.__name__))
+        return 1 << member._ordinal
+
+    def _other_mask(self, other):
+        '''The mask of other, if it is a set for the same class, or None.'''
+        if isinstance(other, BnumSet) and other._cls is self._cls:
+            return other._mask
+        return None
+
+    def __contains__(self, member):
+        return type(member) is self._cls and \
+            (self._mask >> member._ordinal) & 1 == 1
+
+    def __iter__(self):
+        members, mask = self._cls._members, self._mask
+        while mask:
+            low = mask & -mask
+            yield members[low.bit_length() - 1]
+            mask ^= low
+
+    def __len__(self):
+        return popcount(self._mask)
+
+    def __bool__(self):
+        return bool(self._mask)
+
+    def add(self, member):
+        self._mask |= self._bit(member)
+
+    def discard(self, member):
+        if type(member) is self._cls:
+            self._mask &= ~(1 << member._ordinal)
+
+    def remove(self, member):
+        if member not in self:
+            raise KeyError(member)
+        self._mask &= ~(1 << member._ordinal)
+
+    def clear(self):
+        self._mask = 0
+
+    def copy(self):
+        return self.from_mask(self._cls, self._mask)
+
+    def __or__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__or__(other)
+        return self.from_mask(self._cls, self._mask | mask)
+
+    def __and__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__and__(other)
+        return self.from_mask(self._cls, self._mask & mask)
+
+    def __sub__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__sub__(other)
+        return self.from_mask(self._cls, self._mask & ~mask)
+
+    def __xor__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__xor__(other)
+        return self.from_mask(self._cls, self._mask ^ mask)
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __ior__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__ior__(other)
+        self._mask |= mask
+        return self
+
+    def __iand__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__iand__(other)
+        self._mask &= mask
+        return self
+
+    def __isub__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__isub__(other)
+        self._mask &= ~mask
+        return self
+
+    def __ixor__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__ixor__(other)
+        self._mask ^= mask
+        return self
+
+    def __eq__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__eq__(other)
+        return self._mask == mask
+
+    def __le__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__le__(other)
+        return self._mask & ~mask == 0
+
+    def __ge__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__ge__(other)
+        return mask & ~self._mask == 0
+
+    def __lt__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__lt__(other)
+        return self._mask != mask and self._mask & ~mask == 0
+
+    def __gt__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().__gt__(other)
+        return self._mask != mask and mask & ~self._mask == 0
+
+    def isdisjoint(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return super().isdisjoint(other)
+        return not self._mask & mask
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return self.from_mask, (self._cls, self._mask)
+
+    def __repr__(self):
+        return '%s(%s, [%s])' % (self.__class__.__name__, self._cls.__name__,
+                                 ', '.join(map(repr, self)))
+
+
+class BnumMap(MutableMapping):
+    '''
+    A mapping whose keys are instances of a single Bnum class, stored as a
+    list of values indexed by ordinal (so memory is proportional to the
+    number of instances in the class).  Iteration is in the class's value
+    order.
+
+    This is not faster than a dict: instances hash in C, and each operation
+    here runs Python code, so lookup, assignment and "in" are 3 to 6 times
+    slower (see bench_map in bnum.tests.benchmark).
+
+    The list grows if instances are added to the class (see bnum.extensible).
+    '''
+
+    __slots__ = ('_cls', '_values', '_len')
+
+    def __init__(self, cls, items=()):
+        self._cls = cls
+        self._values = [EMPTY] * len(cls._members)
+        self._len = 0
+        if isinstance(items, Mapping):
+            items = items.items()
+        for member, value in items:
+            self[member] = value
+
+    def _ordinal(self, member):
+        if type(member) is not self._cls:
+            raise KeyError(member)
+        return member._ordinal
+
+    # the checks in _ordinal are inlined below for speed
+
+    def _grow(self):
+        '''Extend the list to match the class (which has new instances).'''
+        self._values.extend([EMPTY] * (len(self._cls._members) - len(self._values)))
+
+    def __getitem__(self, member):
+        if type(member) is self._cls:
+            try:
+                value = self._values[member._ordinal]
+            except IndexError:  # added to the class after the map was made
+                value = EMPTY
+            if value is not EMPTY:
+                return value
+        raise KeyError(member)
+
+    def __setitem__(self, member, value):
+        if type(member) is not self._cls:
+            raise KeyError(member)
+        values, ordinal = self._values, member._ordinal
+        if ordinal >= len(values):
+            self._grow()
+        if values[ordinal] is EMPTY:
+            self._len += 1
+        values[ordinal] = value
+
+    def __delitem__(self, member):
+        ordinal = self._ordinal(member)
+        if ordinal >= len(self._values) or self._values[ordinal] is EMPTY:
+            raise KeyError(member)
+        self._values[ordinal] = EMPTY
+        self._len -= 1
+
+    def __contains__(self, member):
+        return type(member) is self._cls and \
+            member._ordinal < len(self._values) and \
+            self._values[member._ordinal] is not EMPTY
+
+    def get(self, member, default=None):
+        if type(member) is not self._cls:
+            return default
+        try:
+            value = self._values[member._ordinal]
+        except IndexError:
+            return default
+        return default if value is EMPTY else value
+
+    def __iter__(self):
+        return (member for member, value in zip(self._cls._members, self._values)
+                if value is not EMPTY)
+
+    def __len__(self):
+        return self._len
+
+    def clear(self):
+        self._values = [EMPTY] * len(self._values)
+        self._len = 0
+
+    def copy(self):
+        instance = self.__class__.__new__(self.__class__)
+        instance._cls = self._cls
+        instance._values = list(self._values)
+        instance._len = self._len
+        return instance
+
+    def __reduce__(self):
+        return self.__class__, (self._cls, list(self.items()))
+
+    def __repr__(self):
+        return '%s(%s, {%s})' % (self.__class__.__name__, self._cls.__name__,
+                                 ', '.join('%r: %r' % item
+                                           for item in self.items()))
@@ -0,0 +1,143 @@
+
+from threading import Lock
+from types import MappingProxyType
+
+from bnum import Bnum, BnumDict, BnumMeta, BnumLookupMeta, ILLEGAL_NAMES, \
+    names
+from enum import dunder
+
+'''
+Bnum classes that can gain instances after they are defined (for codes that
+are only known at runtime):
+
+    >>> class Status(OpenBnum):
+    ...     ok = 200
+    ...
+    >>> teapot = Status.register('teapot', 418)
+    >>> Status(418) is teapot is Status.teapot
+    True
+
+Registration takes a lock, builds new lookup tables (copies of the old ones,
+plus the new instance) and then replaces the tables held by the class.  The
+tables themselves are never modified, so lookup, iteration, etc do not lock:
+they see either the old or the new tables (and the new tables contain all
+the old instances).
+
+New instances are appended to the instances in value order, so existing
+instances keep their ordinals (and new ordinals are in registration order).
+'''
+
+
+# names that cannot be used for instances of open classes
+RESERVED_NAMES = ILLEGAL_NAMES | {'register'}
+
+# marks a call to register() without a value
+IMPLICIT = object()
+
+
+def _register(cls, name, value):
+    '''Unpickle an instance of an open class, registering it if needed.'''
+    return cls.register(name, value)
+
+
+class OpenBnumMeta(BnumLookupMeta, BnumMeta):
+    '''
+    Constructs classes whose instances can be extended with register().
+    Instances are found by __getattr__ (the lookup tables are replaced on
+    registration, so instances are not class attributes).
+    '''
+
+    _extensible = True
+
+    @classmethod
+    def __prepare__(metacls, cls, bases,
+                values=None, allow_aliases=False, fast_attributes=False,
+                slots=False, ordered=False, missing_cache=0):
+        return BnumDict(implicit=False, values=values() if values else names())
+
+    def __new__(metacls, cls, bases, classdict,
+                values=None, allow_aliases=False, fast_attributes=False,
+                slots=False, ordered=False, missing_cache=0):
+        if 'register' in classdict:
+            raise ValueError('Enumeration names cannot include register')
+        obj_type, first_enum = metacls._get_mixins(bases)
+        __new__, save_new, use_args = \
+            metacls._find_new(classdict, obj_type, first_enum)
+        enum_class = super().__new__(metacls, cls, bases, classdict,
+                                     values=values, allow_aliases=allow_aliases,
+                                     fast_attributes=fast_attributes,
+                                     slots=slots, ordered=ordered,
+                                     missing_cache=missing_cache)
+        enum_class._factory = obj_type, __new__, use_args
+        # continue any implicit values (eg counters) from the class body
+        enum_class._implicit = classdict.values \
+            if isinstance(classdict, BnumDict) else \
+            values() if values else names()
+        enum_class._lock = Lock()
+        return enum_class
+
+    def register(cls, name, value=IMPLICIT):
+        '''
+        Add (and return) an instance with the given name and value (if no
+        value is given, one is provided as for names in the class body).
+        If the name exists with the same value (or no value is given) the
+        existing instance is returned; a different value, or a value that
+        exists with a different name, is a ValueError.
+        '''
+        if cls is OpenBnum:
+            raise TypeError('Only subclasses of OpenBnum can register instances')
+        with cls._lock:
+            enum_item = cls._enums_by_name.get(name)
+            if enum_item is not None:
+                if value is IMPLICIT or enum_item._value == value:
+                    return enum_item
+                raise ValueError('Inconsistent name (%r) and value (%r)' %
+                                 (name, value))
+            if not isinstance(name, str) or dunder(name) or \
+                    name in RESERVED_NAMES:
+                raise ValueError('Invalid name %r' % (name, ))
+            if value is IMPLICIT:
+                value = cls._implicit(name)
+            enum_item = cls._create_member(cls, name, value, *cls._factory)
+            value = enum_item._value
+            if value in cls._enums_by_value:
+                raise ValueError('Duplicate value for %s, %s' %
+                                 (name, cls._enums_by_value[value]._name))
+            enum_item._ordinal = len(cls._members)
+            members = cls._members + (enum_item, )
+            # built before anything is published, since a unique index
+            # may reject the instance
+            tables = [index._build(members) for index in cls._indexes]
+            enums_by_name = dict(cls._enums_by_name)
+            enums_by_name[name] = enum_item
+            enums_by_value = dict(cls._enums_by_value)
+            enums_by_value[value] = enum_item
+            # publish.  each table is replaced by a single assignment, and
+            # the new tables include all the old instances, so readers see
+            # consistent results in any order
+            cls._members = members
+            cls._enums_by_value = enums_by_value
+            cls._enums_by_name = enums_by_name
+            cls._members_proxy = MappingProxyType(enums_by_name)
+            # derived tables are rebuilt on next use
+            cls._parse_index = None
+            cls._value_order = None
+            if '_value_table' in cls.__dict__:
+                cls._value_table = None
+            for index, table in zip(cls._indexes, tables):
+                index._table = table
+            return enum_item
+
+
+class OpenBnum(Bnum, metaclass=OpenBnumMeta):
+    '''
+    A Bnum class whose instances can be extended (see register()).  Values
+    are explicit in the class body (names can be given without values
+    inside "with implicit").
+    '''
+
+    __slots__ = ()
+
+    def __reduce_ex__(self, protocol):
+        # registered if needed when unpickled (eg in another process)
+        return _register, (self.__class__, self._name, self._value)
@@ -0,0 +1,108 @@
+
+from collections.abc import Mapping
+
+'''
+Secondary indexes, from the value of an attribute of each instance to the
+instance (or instances) with that value.  Indexes are declared in the class
+body and built once, when the class is created:
+
+    >>> class Animal(ExplicitBnum):
+    ...     by_noise = UniqueIndex('noise')
+    ...     by_legs = Index('legs')
+    ...     def __init__(self, legs, noise):
+    ...         self.legs = legs
+    ...         self.noise = noise
+    ...     pig = 4, 'oink'
+    ...     hen = 2, 'cluck'
+    ...     cow = 4, 'moo'
+    ...
+    >>> Animal.by_noise['moo']
+    Animal(value=(4, 'moo'), name='cow')
+    >>> Animal.by_legs[4]
+    (Animal(value=(4, 'moo'), name='cow'), Animal(value=(4, 'oink'), name='pig'))
+
+Lookup is a single dict lookup.  A repeated value in a UniqueIndex is a
+ValueError when the class is created.
+'''
+
+
+class Index(Mapping):
+    '''
+    A mapping from the value of an attribute to a tuple of the instances with
+    that value (in the class's order).  get() returns an empty tuple for an
+    unknown value.
+    '''
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self._table = {}
+        self._owner = None
+
+    def __get__(self, instance, owner):
+        return self
+
+    def _bind(self, cls):
+        '''Build the index for a (new) class.'''
+        if self._owner is not None and self._owner is not cls:
+            raise TypeError('%r is already used by %s' %
+                            (self, self._owner.__name__))
+        self._owner = cls
+        self._table = self._build(cls._members)
+
+    def _build(self, members):
+        '''A new table for the given instances (the index is not changed).'''
+        groups = {}
+        for enum_item in members:
+            key = getattr(enum_item, self.attribute)
+            try:
+                group = groups.get(key)
+            except TypeError:
+                raise TypeError('Unhashable %s for %r' %
+                                (self.attribute, enum_item)) from None
+            if group is None:
+                groups[key] = group = []
+            group.append(enum_item)
+        return dict((key, tuple(group)) for key, group in groups.items())
+
+    def __getitem__(self, key):
+        return self._table[key]
+
+    def get(self, key, default=()):
+        return self._table.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._table
+
+    def __iter__(self):
+        return iter(self._table)
+
+    def __len__(self):
+        return len(self._table)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.attribute)
+
+
+class UniqueIndex(Index):
+    '''
+    A mapping from the value of an attribute to the single instance with that
+    value.  get() returns None for an unknown value.
+    '''
+
+    def _build(self, members):
+        table = {}
+        for enum_item in members:
+            key = getattr(enum_item, self.attribute)
+            try:
+                previous = table.setdefault(key, enum_item)
+            except TypeError:
+                raise TypeError('Unhashable %s for %r' %
+                                (self.attribute, enum_item)) from None
+            if previous is not enum_item:
+                raise ValueError('Duplicate %s (%r) for %s, %s' %
+                                 (self.attribute, key, previous.name,
+                                  enum_item.name))
+        return table
+
+    def get(self, key, default=None):
+        return self._table.get(key, default)
@@ -0,0 +1,93 @@
+
+from json import JSONEncoder, JSONDecoder
+
+from bnum import Bnum
+
+'''
+JSON support for structures containing Bnum instances.
+
+Instances are written as their values (or names):
+
+    >>> dumps({'colour': Colour.red}, cls=BnumEncoder)
+    '{"colour": "red"}'
+
+and read back by giving the class expected for each field:
+
+    >>> loads('{"colour": "red"}', cls=BnumDecoder, schema={'colour': Colour})
+    {'colour': Colour('red')}
+
+Encoding uses a table from instance to value that is filled on first use,
+so repeated instances are written without calling Python code; decoding uses
+the tables held by each class (_enums_by_value or _enums_by_name).
+'''
+
+
+def hashable(value):
+    '''Convert JSON arrays to tuples (so that tuple values can be found).'''
+    if isinstance(value, list):
+        return tuple(map(hashable, value))
+    return value
+
+
+class EncodingTable(dict):
+    '''
+    A dict from instance to the value (or name) written to JSON, filled as
+    instances are found.  The encoder calls __getitem__ directly (it is the
+    default method), so only the first use of each instance calls Python.
+    '''
+
+    def __init__(self, by_name=False):
+        super().__init__()
+        self.by_name = by_name
+
+    def __missing__(self, obj):
+        if not isinstance(obj, Bnum):
+            raise TypeError('Object of type %s is not JSON serializable' %
+                            obj.__class__.__name__)
+        value = self[obj] = obj._name if self.by_name else obj._value
+        return value
+
+
+class BnumEncoder(JSONEncoder):
+    '''
+    A JSON encoder that writes instances as their values or, with
+    by_name=True, their names.  Instances of classes with int, str or float
+    mixins are written by the json module itself, as the mixin type.
+    '''
+
+    def __init__(self, *args, by_name=False, **kargs):
+        super().__init__(*args, **kargs)
+        self.default = EncodingTable(by_name).__getitem__
+
+
+class BnumDecoder(JSONDecoder):
+    '''
+    A JSON decoder that converts the fields named in schema (a mapping from
+    field name to Bnum class) to instances.  The fields contain values or,
+    with by_name=True, names.  A missing value (or name) is a ValueError.
+
+    Any object_hook given is called after conversion.
+    '''
+
+    def __init__(self, *args, schema=None, by_name=False, object_hook=None,
+                 **kargs):
+        super().__init__(*args, object_hook=self._object_hook, **kargs)
+        self.tables = [(field, cls._enums_by_name if by_name else cls._enums_by_value)
+                       for field, cls in (schema or {}).items()]
+        self.user_hook = object_hook
+
+    def _object_hook(self, obj):
+        for field, table in self.tables:
+            if field in obj:
+                value = obj[field]
+                try:
+                    obj[field] = table[value]
+                except (KeyError, TypeError):
+                    try:
+                        obj[field] = table[hashable(value)]
+                    except (KeyError, TypeError):
+                        raise ValueError('No value %r for %s' %
+                                         (value, field)) from None
+        if self.user_hook is not None:
+            obj = self.user_hook(obj)
+        return obj
@@ -0,0 +1,109 @@
+
+'''
+Lookup of instances from untrusted text (user input, logs, etc), ignoring
+case and whitespace, and accepting unique prefixes.
+
+The index for each class is built on first use.  Lookup takes time
+proportional to the length of the text, whatever the number of instances:
+exact names are found in a dict; prefixes by walking a trie (nested dicts,
+one level per character) in which each node records the single instance
+below it, or AMBIGUOUS.
+'''
+
+
+# marks a name (or prefix) that matches more than one instance
+AMBIGUOUS = object()
+
+# the key, in each trie node, for the unique instance below that node
+UNIQUE = ''
+
+
+class AmbiguousName(ValueError):
+    '''
+    Raised when text matches more than one instance.  The instances are
+    available as matches.
+    '''
+
+    def __init__(self, text, matches):
+        super().__init__('Ambiguous name %r (%s)' %
+                         (text, ', '.join(match.name for match in matches)))
+        self.matches = matches
+
+
+def normalize(text):
+    '''Case-fold and collapse whitespace.'''
+    return ' '.join(text.split()).casefold()
+
+
+def merge(previous, enum_item):
+    '''The value for a key that previous and enum_item both match.'''
+    if previous is None or previous is enum_item:
+        return enum_item
+    return AMBIGUOUS
+
+
+class ParseIndex:
+    '''
+    A dict from normalized name to instance (or a list of instances, if
+    ambiguous), and a prefix trie.  Aliases are included, but do not make a
+    name ambiguous.
+    '''
+
+    def __init__(self, cls):
+        self.exact, self.trie = {}, {}
+        for name, enum_item in cls._enums_by_name.items():
+            key = normalize(name)
+            previous = self.exact.get(key)
+            if previous is None or previous is enum_item:
+                self.exact[key] = enum_item
+            elif type(previous) is list:
+                if not any(match is enum_item for match in previous):
+                    previous.append(enum_item)
+            else:  # names that differ only in case, etc
+                self.exact[key] = [previous, enum_item]
+            node = self.trie
+            for character in key:
+                node = node.setdefault(character, {})
+                node[UNIQUE] = merge(node.get(UNIQUE), enum_item)
+
+    def matches(self, key):
+        '''All the (distinct) instances whose names start with key.'''
+        found = {}
+        for name, matches in self.exact.items():
+            if name.startswith(key):
+                for enum_item in matches if type(matches) is list else [matches]:
+                    found[id(enum_item)] = enum_item
+        return tuple(sorted(found.values(), key=lambda enum: enum._ordinal))
+
+    def parse(self, text, prefix=True):
+        key = ' '.join(text.split()).casefold()  # normalize(), inlined
+        enum_item = self.exact.get(key)
+        if enum_item is not None:
+            if type(enum_item) is list:
+                raise AmbiguousName(text, tuple(enum_item))
+            return enum_item
+        if prefix and key:
+            node = self.find(key)
+            if node is not None:
+                enum_item = node[UNIQUE]
+                if enum_item is AMBIGUOUS:
+                    raise AmbiguousName(text, self.matches(key))
+                return enum_item
+        raise ValueError('No name %r' % text)
+
+    def find(self, key):
+        '''The trie node for a key, or None.'''
+        node = self.trie
+        for character in key:
+            node = node.get(character)
+            if node is None:
+                return None
+        return node
+
+
+def parse_index(cls):
+    '''Return the (cached) ParseIndex for a class.'''
+    index = cls._parse_index
+    if index is None:
+        index = cls._parse_index = ParseIndex(cls)
+    return index
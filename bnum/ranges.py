@@ -0,0 +1,76 @@
+
+from bisect import bisect_left, bisect_right
+
+'''
+Queries on the values of classes whose values can be ordered (numeric
+thresholds, bucket boundaries, etc): the instances with values in a range,
+and the instance with the closest value below, above, or either side of a
+given value.
+
+The values are held in a sorted list (built on first use), which is searched
+with bisect, so each query takes time proportional to the log of the number
+of instances.
+'''
+
+
+class ValueOrder:
+    '''
+    The values of a class, sorted, and the matching instances.  Raises
+    TypeError if the values cannot be ordered.
+    '''
+
+    def __init__(self, cls):
+        try:
+            values = sorted(cls._enums_by_value)
+        except TypeError:
+            raise TypeError('Values of %s cannot be ordered' %
+                            cls.__name__) from None
+        self.values = values
+        self.members = tuple(map(cls._enums_by_value.__getitem__, values))
+        # NumPy arrays of values and ordinals (see bnum.arrays.locate)
+        self.arrays = None
+
+    def range(self, low=None, high=None):
+        '''The instances with low <= value < high (either can be None).'''
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else \
+            bisect_left(self.values, high)
+        return self.members[start:end]
+
+    def floor(self, value, default=None):
+        '''The instance with the largest value <= value, or default.'''
+        if value != value:  # nan
+            return default
+        position = bisect_right(self.values, value) - 1
+        return self.members[position] if position >= 0 else default
+
+    def ceil(self, value, default=None):
+        '''The instance with the smallest value >= value, or default.'''
+        if value != value:
+            return default
+        position = bisect_left(self.values, value)
+        return self.members[position] if position < len(self.members) \
+            else default
+
+    def nearest(self, value, default=None):
+        '''
+        The instance whose value is closest to value (the lower, if two are
+        equally close), or default (if there are no instances).
+        '''
+        if value != value or not self.members:
+            return default
+        position = bisect_left(self.values, value)
+        if position == len(self.values):
+            return self.members[-1]
+        if position and \
+                value - self.values[position - 1] <= self.values[position] - value:
+            return self.members[position - 1]
+        return self.members[position]
+
+
+def value_order(cls):
+    '''Return the (cached) ValueOrder for a class.'''
+    order = cls._value_order
+    if order is None:
+        order = cls._value_order = ValueOrder(cls)
+    return order
@@ -0,0 +1,118 @@
+
+from collections import Counter
+from itertools import islice
+
+'''
+Decoding streams of values (or names) to instances, with a policy for
+unknown values that does not involve raising (and catching) an exception
+for each one.
+
+Values are read in batches and looked up with dict.get (via map, so the
+loop is in C).  Only batches that contain unknown values are examined
+further.
+'''
+
+
+RAISE, SKIP, COLLECT, DEFAULT = 'raise', 'skip', 'collect', 'default'
+
+BATCH_SIZE = 1024
+
+
+class DecodeIter:
+    '''
+    An iterator over the instances for the values (or names) in an
+    iterable.  Unknown values are handled according to on_missing:
+
+    - 'raise' raises ValueError (after the preceding instances);
+    - 'skip' discards them;
+    - 'collect' discards them, but appends (index, value) to missing;
+    - 'default' replaces them with default.
+
+    In all cases, misses counts the unknown values (unhashable values are
+    counted by repr()).  Values are first passed to the class's _missing_
+    (if it defines one), as for Cls(value), and are unknown only if that
+    does not give an instance.
+    '''
+
+    def __init__(self, cls, iterable, on_missing=RAISE, default=None,
+                 by_name=False, batch_size=BATCH_SIZE):
+        if on_missing not in (RAISE, SKIP, COLLECT, DEFAULT):
+            raise ValueError('Unknown policy %r' % on_missing)
+        self.table = cls._enums_by_name if by_name else cls._enums_by_value
+        self.find_missing = None if by_name or cls._missing_hook is None \
+            else cls._find_missing
+        self.on_missing, self.default = on_missing, default
+        self.misses, self.missing = Counter(), []
+        self._batches = self._decode(iter(iterable), batch_size)
+
+    def __iter__(self):
+        # the generator itself, to avoid calling __next__ for each instance
+        return self._batches
+
+    def __next__(self):
+        return next(self._batches)
+
+    def _decode(self, values, batch_size):
+        get, index = self.table.get, 0
+        while True:
+            batch = list(islice(values, batch_size))
+            if not batch:
+                return
+            try:
+                results = list(map(get, batch))
+            except TypeError:  # unhashable
+                results = [self._get(value) for value in batch]
+            if None in results:
+                results = self._fix(batch, results, index)
+            yield from results
+            index += len(batch)
+
+    def _get(self, value):
+        try:
+            return self.table.get(value)
+        except TypeError:
+            return None
+
+    def _fix(self, batch, results, index):
+        '''
+        Apply the policy to a batch containing unknown values.  The unknown
+        values are found with list.index (in C), so the cost is proportional
+        to the number of unknown values, not the batch size.
+        '''
+        positions, position = [], -1
+        try:
+            while True:
+                position = results.index(None, position + 1)
+                positions.append(position)
+        except ValueError:
+            pass
+        if self.find_missing is not None:
+            unknown = []
+            for position in positions:
+                enum = self.find_missing(batch[position])
+                if enum is None:
+                    unknown.append(position)
+                else:
+                    results[position] = enum
+            positions = unknown
+        for position in positions:
+            value = batch[position]
+            try:
+                self.misses[value] += 1
+            except TypeError:
+                self.misses[repr(value)] += 1
+            if self.on_missing == RAISE:
+                return self._raise(results[:position], value)
+            elif self.on_missing == DEFAULT:
+                results[position] = self.default
+            elif self.on_missing == COLLECT:
+                self.missing.append((index + position, value))
+        if self.on_missing != DEFAULT:
+            for position in reversed(positions):
+                del results[position]
+        return results
+
+    def _raise(self, results, value):
+        '''Yield the instances before value, then raise.'''
+        yield from results
+        raise ValueError('No value %r' % value)
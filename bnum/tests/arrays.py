@@ -0,0 +1,173 @@
+
+from unittest import TestCase
+
+import numpy as np
+
+from bnum import ImplicitBnum, ExplicitBnum, from_one, bits
+from bnum.arrays import BnumArray
+
+
+'''
+Test the vectorized (NumPy) support.
+'''
+
+
+class Weekday(ImplicitBnum, values=from_one):
+    monday, tuesday, wednesday, thursday, friday
+    saturday, sunday
+
+
+class Emphasis(ImplicitBnum, values=bits):
+    underline
+    italic
+    bold
+
+
+class Colour(ImplicitBnum):
+    red
+    green
+    blue
+
+
+class Strange(ExplicitBnum):
+    foo = 42
+    bar = 'fish'
+
+
+class FloatStooges(float, ExplicitBnum):
+    LARRY = 1.39
+    CURLY = 2.72
+    MOE = 3.142596
+
+
+class FromValuesTest(TestCase):
+
+    def test_ordinals(self):
+        assert [enum._ordinal for enum in Colour] == [0, 1, 2]
+        assert Colour.blue._ordinal == 0, Colour.blue._ordinal
+
+    def test_dense(self):
+        ordinals = Weekday.from_values(np.array([7, 1, 3], dtype=np.uint8))
+        assert ordinals.tolist() == [6, 0, 2], ordinals
+        assert Emphasis.from_values([4, 1]).tolist() == [2, 0]
+
+    def test_sorted(self):
+        ordinals = Colour.from_values(np.array(['red', 'blue', 'red']))
+        assert ordinals.tolist() == [2, 0, 2], ordinals
+        ordinals = FloatStooges.from_values([3.142596, 1.39])
+        assert ordinals.tolist() == [2, 0], ordinals
+
+    def test_generic(self):
+        assert Strange.from_values(['fish', 42]).tolist() == [1, 0]
+
+    def test_buffer(self):
+        from array import array
+        ordinals = Weekday.from_values(array('i', [2, 4]))
+        assert ordinals.tolist() == [1, 3], ordinals
+        assert Weekday.from_values(bytes([1, 2])).tolist() == [0, 1]
+
+    def test_shape(self):
+        ordinals = Weekday.from_values(np.array([[1, 2], [3, 4]]))
+        assert ordinals.shape == (2, 2), ordinals.shape
+
+    def test_missing(self):
+        with self.assertRaises(ValueError):
+            Weekday.from_values([1, 8])
+        with self.assertRaises(ValueError):
+            Colour.from_values(['red', 'pink'])
+
+
+class IsInTest(TestCase):
+
+    def test_isin(self):
+        assert Weekday.isin([0, 1, 7, 8]).tolist() == [False, True, True, False]
+        assert Emphasis.isin([1, 3, 4]).tolist() == [True, False, True]
+        assert Colour.isin(['red', 'pink']).tolist() == [True, False]
+        assert Strange.isin([42, 'fish', 'foo']).tolist() == [True, True, False]
+
+    def test_wrong_type(self):
+        assert Weekday.isin(['monday']).tolist() == [False]
+        assert Colour.isin([1, 2]).tolist() == [False, False]
+
+
+class BnumArrayTest(TestCase):
+
+    def test_storage(self):
+        days = BnumArray(Weekday, [Weekday.monday, Weekday.sunday, Weekday.monday])
+        assert days.ordinals.dtype == np.uint8, days.ordinals.dtype
+        assert len(days) == 3
+        assert days.tolist() == [Weekday.monday, Weekday.sunday, Weekday.monday]
+        assert list(days) == days.tolist()
+        assert days[1] is Weekday.sunday
+        assert bytes(memoryview(days.ordinals)) == b'\x00\x06\x00'
+        assert np.asarray(days) is days.ordinals
+        with self.assertRaises(TypeError):
+            BnumArray(Weekday, [Colour.red])
+
+    def test_from_values(self):
+        days = BnumArray.from_values(Weekday, [7, 1, 3])
+        assert days.tolist() == [Weekday.sunday, Weekday.monday, Weekday.wednesday]
+        with self.assertRaises(ValueError):
+            BnumArray.from_values(Weekday, [8])
+        with self.assertRaises(IndexError):
+            BnumArray.from_ordinals(Weekday, [7])
+
+    def test_slice(self):
+        days = BnumArray.from_values(Weekday, [1, 2, 3, 4, 5])
+        middle = days[1:4]
+        assert middle.ordinals.base is days.ordinals
+        middle[0] = Weekday.sunday
+        assert days[1] is Weekday.sunday
+        days[:2] = [Weekday.friday, Weekday.friday]
+        assert days.tolist()[:3] == [Weekday.friday, Weekday.friday, Weekday.wednesday]
+
+    def test_compare(self):
+        days = BnumArray.from_values(Weekday, [1, 6, 7, 6])
+        assert (days == Weekday.saturday).tolist() == [False, True, False, True]
+        assert (days != Weekday.saturday).tolist() == [True, False, True, False]
+        assert (days == days).all()
+        weekend = days.isin([Weekday.saturday, Weekday.sunday, Colour.red])
+        assert weekend.tolist() == [False, True, True, True]
+
+    def test_gather(self):
+        days = BnumArray.from_values(Weekday, [7, 1])
+        assert days.gather().tolist() == [7, 1]
+        assert days.gather('name').tolist() == ['sunday', 'monday']
+        strange = BnumArray(Strange, [Strange.bar, Strange.foo])
+        assert strange.gather().tolist() == ['fish', 42], strange.gather()
+
+
+class LocateTest(TestCase):
+
+    def test_floor(self):
+        readings = np.array([0.0, 1.0, 2.5, 3.0, 9.0])
+        ordinals = FloatStooges.locate(readings)
+        assert ordinals.tolist() == [-1, -1, 0, 1, 2], ordinals
+        assert [FloatStooges[i] if i >= 0 else None for i in ordinals] == \
+               [FloatStooges.floor(r) for r in readings]
+
+    def test_ceil(self):
+        readings = [0.0, 1.0, 2.5, 3.0, 9.0]
+        ordinals = FloatStooges.locate(readings, how='ceil')
+        assert ordinals.tolist() == [0, 0, 1, 2, -1], ordinals
+
+    def test_nearest(self):
+        readings = [-5, 1.5, 1.6, 2.5, 100]
+        ordinals = FloatStooges.locate(readings, how='nearest')
+        expected = [FloatStooges.nearest(r)._ordinal for r in readings]
+        assert ordinals.tolist() == expected, (ordinals, expected)
+
+    def test_integers(self):
+        ordinals = Weekday.locate(np.arange(10), how='ceil')
+        assert ordinals.tolist() == [0, 0, 1, 2, 3, 4, 5, 6, -1, -1], ordinals
+
+    def test_nan(self):
+        for how in ('floor', 'ceil', 'nearest'):
+            ordinals = FloatStooges.locate([np.nan, 2.72], how=how)
+            assert ordinals.tolist() == [-1, 1], (how, ordinals)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            Weekday.locate([1], how='round')
+        with self.assertRaises(TypeError):
+            Strange.locate([1])
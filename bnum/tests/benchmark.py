@@ -0,0 +1,476 @@
+
+import sys
+from pickle import dumps, loads
+from random import Random
+from timeit import Timer
+from types import MappingProxyType
+
+from bnum import ExplicitBnum, ImplicitBnum
+
+'''
+Rough timings for performance-sensitive operations.  Run with
+python -m bnum.tests.benchmark
+'''
+
+
+SIZES = (10, 1000, 100000)
+
+
+def best(statement, number=10, repeat=5, **names):
+    '''Best time, in ns, for a single execution of the statement.'''
+    timer = Timer(statement, globals=names)
+    return min(timer.repeat(repeat=repeat, number=number)) * 1e9 / number
+
+
+def report(title, **timings):
+    print('%-40s %s' % (title, '  '.join('%s %8.1fns' % (name, time)
+                                          for name, time in timings.items())))
+
+
+def explicit(size, value=lambda i: i + 1, name='Big', bases=(ExplicitBnum,),
+             **kargs):
+    '''An ExplicitBnum with the given number of instances.'''
+    classdict = dict(('n%d' % i, value(i)) for i in range(size))
+    return type(bases[-1])(name, bases, classdict, **kargs)
+
+
+def instance_size(instance):
+    '''Bytes used by an instance, including any __dict__ (but not the value).'''
+    return sys.getsizeof(instance) + \
+        (sys.getsizeof(instance.__dict__) if hasattr(instance, '__dict__') else 0)
+
+
+def sample(cls, count=1000, seed=0):
+    '''Values from the class, in random order.'''
+    values = [enum.value for enum in cls]
+    return [Random(seed).choice(values) for _ in range(count)]
+
+
+def baseline_call(cls, value=None, name=None):
+    '''BnumMeta.__call__ before any optimisation (for comparison).'''
+    if type(value) is cls:
+        if name is None or name == value.name:
+            return value
+    elif value is None:
+        if name is None:
+            raise ValueError('Give name or value')
+        elif name in cls._enums_by_name:
+            return cls._enums_by_name[name]
+        else:
+            raise ValueError('No name %r' % name)
+    elif name is None:
+        if value in cls._enums_by_value:
+            return cls._enums_by_value[value]
+        else:
+            raise ValueError('No value %r' % value)
+    elif name in cls._enums_by_name:
+        enum = cls._enums_by_name[name]
+        if value in cls._enums_by_value and \
+                    enum is cls._enums_by_value[value]:
+            return enum
+    raise ValueError('Inconsistent name (%r) and value (%r)' %
+                    (name, value))
+
+
+def bench_call():
+    # both called directly (not through the class), so that only the body
+    # of __call__ differs
+    call = type(ExplicitBnum).__call__
+    for kind, value in (('counter', lambda i: i + 1),
+                        ('bits', lambda i: 2 ** i),
+                        ('str', lambda i: 'v%d' % i)):
+        for size in SIZES:
+            if kind == 'bits' and size > 1000:
+                continue  # 2 ** 100000 is not a sensible value
+            cls = explicit(size, value)
+            values = sample(cls)
+            report('Cls(value), %s, %d' % (kind, size),
+                   bnum=best('for v in values: call(cls, v)', call=call,
+                             cls=cls, values=values) / len(values),
+                   baseline=best('for v in values: call(cls, v)',
+                                 call=baseline_call, cls=cls,
+                                 values=values) / len(values))
+
+
+def bench_attributes():
+    for size in SIZES:
+        lookup = explicit(size)
+        fast = explicit(size, fast_attributes=True)
+        name = 'n%d' % (size // 2)
+        report('Cls.%s, %d' % (name, size),
+               fast=best('for _ in loop: cls.%s' % name, number=1,
+                         cls=fast, loop=range(10000)) / 10000,
+               lookup=best('for _ in loop: cls.%s' % name, number=1,
+                           cls=lookup, loop=range(10000)) / 10000)
+        report('Cls(value), %d' % size,
+               fast=best('for _ in loop: cls(1)', number=1,
+                         cls=fast, loop=range(10000)) / 10000,
+               lookup=best('for _ in loop: cls(1)', number=1,
+                           cls=lookup, loop=range(10000)) / 10000)
+
+
+def bench_iteration():
+    for size in (10, 1000):
+        cls = explicit(size, fast_attributes=True)
+        report('iter(Cls), %d' % size,
+               tuple=best('for _ in cls: pass', cls=cls) / size,
+               generator=best('for _ in (cls._enums_by_value[value] '
+                              'for value in cls._enums_by_value): pass',
+                              cls=cls) / size)
+        report('Cls.__members__, %d' % size,
+               cached=best('cls.__members__', number=1000, cls=cls),
+               proxy=best('MappingProxyType(cls._enums_by_name)', number=1000,
+                          cls=cls, MappingProxyType=MappingProxyType))
+
+
+def class_body(size, base='ImplicitBnum'):
+    '''
+    Source for a class with the given number of instances (implicit, or with
+    integer values for ExplicitBnum).
+    '''
+    value = ' = %d' if base == 'ExplicitBnum' else ''
+    return 'class Big(%s):\n%s' % \
+           (base, ''.join(('    n%d' + value + '\n') % ((i, i) if value else i)
+                          for i in range(size)))
+
+
+def bench_create():
+    for size in (10, 1000, 10000):
+        names = ['n%d' % i for i in range(size)]
+        timings = dict(
+            functional=best('ImplicitBnum("Big", names)', number=1,
+                            ImplicitBnum=ImplicitBnum, names=names))
+        for base in ('ImplicitBnum', 'ExplicitBnum'):
+            code = compile(class_body(size, base), 'benchmark', 'exec')
+            timings[base[:8].lower()] = \
+                best('exec(code, bases)', number=1, code=code,
+                     bases={'ImplicitBnum': ImplicitBnum,
+                            'ExplicitBnum': ExplicitBnum})
+        # per instance
+        report('create, %d' % size,
+               **dict((name, time / size) for name, time in timings.items()))
+
+
+def bench_set():
+    from bnum.containers import BnumSet
+    for size in (10, 1000):
+        cls = explicit(size, fast_attributes=True)
+        half, other = list(cls)[::2], list(cls)[::3]
+        bnum_set, bnum_other = BnumSet(cls, half), BnumSet(cls, other)
+        plain_set, plain_other = set(half), set(other)
+        member = cls[size // 2]
+        report('member in set, %d' % size,
+               bnum=best('member in s', number=1000, s=bnum_set, member=member),
+               set=best('member in s', number=1000, s=plain_set, member=member))
+        report('set | set, %d' % size,
+               bnum=best('a | b', number=100, a=bnum_set, b=bnum_other),
+               set=best('a | b', number=100, a=plain_set, b=plain_other))
+        report('len(set), %d' % size,
+               bnum=best('len(s)', number=1000, s=bnum_set),
+               set=best('len(s)', number=1000, s=plain_set))
+
+
+def bench_map():
+    from bnum.containers import BnumMap
+    for size in (10, 1000):
+        cls = explicit(size, fast_attributes=True)
+        items = [(member, 0) for member in list(cls)[::2]]
+        bnum_map, plain_dict = BnumMap(cls, items), dict(items)
+        member = items[len(items) // 2][0]
+        report('map[member], %d' % size,
+               bnum=best('m[member]', number=1000, m=bnum_map, member=member),
+               dict=best('m[member]', number=1000, m=plain_dict, member=member))
+        report('map[member] = 1, %d' % size,
+               bnum=best('m[member] = 1', number=1000, m=bnum_map, member=member),
+               dict=best('m[member] = 1', number=1000, m=plain_dict, member=member))
+        report('member in map, %d' % size,
+               bnum=best('member in m', number=1000, m=bnum_map, member=member),
+               dict=best('member in m', number=1000, m=plain_dict, member=member))
+
+
+def bench_array():
+    try:
+        from bnum.arrays import BnumArray
+    except ImportError:
+        return
+    cls = explicit(100, fast_attributes=True)
+    members = [cls[i % 100] for i in range(100000)]
+    array = BnumArray(cls, members)
+    member = cls[7]
+    report('count == member, 100000',
+           bnum=best('(a == member).sum()', number=10, a=array, member=member),
+           list=best('sum(m is member for m in a)', number=10, a=members, member=member))
+    report('gather values, 100000',
+           bnum=best('a.gather()', number=10, a=array),
+           list=best('[m.value for m in a]', number=10, a=members))
+
+
+def bench_layout():
+    for mixin, value in ((None, lambda i: i + 1), (int, int), (str, str)):
+        bases = (ExplicitBnum,) if mixin is None else (mixin, ExplicitBnum)
+        title = mixin.__name__ if mixin else 'plain'
+        dict_member = explicit(100, value, bases=bases)[50]
+        slots_member = explicit(100, value, bases=bases, slots=True)[50]
+        report('.value, %s' % title,
+               dict=best('m.value', number=1000, m=dict_member),
+               slots=best('m.value', number=1000, m=slots_member))
+        print('%-40s dict %8d  slots %8d' % ('bytes per instance, %s' % title,
+                                             instance_size(dict_member),
+                                             instance_size(slots_member)))
+
+
+def bench_hash():
+    # the methods used before hashes were fixed at creation
+    def __hash__(self):
+        return hash(self._name)
+    def __eq__(self, other):
+        if type(other) is self.__class__:
+            return self is other
+        return NotImplemented
+    base = type(ExplicitBnum)('Python', (ExplicitBnum,),
+                              {'__hash__': __hash__, '__eq__': __eq__})
+    for size in (10, 1000):
+        fixed = list(explicit(size))
+        python = list(explicit(size, bases=(base,)))
+        report('dict[member], %d' % size,
+               fixed=best('d[m]', number=1000, d=dict.fromkeys(fixed), m=fixed[-1]),
+               python=best('d[m]', number=1000, d=dict.fromkeys(python), m=python[-1]))
+        report('set(members), %d' % size,
+               fixed=best('set(ms)', number=10, ms=fixed) / size,
+               python=best('set(ms)', number=10, ms=python) / size)
+        report('member == member, %d' % size,
+               fixed=best('a == b', number=1000, a=fixed[0], b=fixed[-1]),
+               python=best('a == b', number=1000, a=python[0], b=python[-1]))
+
+
+def bench_pickle():
+    cls = explicit(100, value=lambda i: (i, 'value %d' % i), fast_attributes=True)
+    members = [cls[i % 100] for i in range(10000)]
+    values = [member.value for member in members]
+    for name, data in (('members', members), ('values', values)):
+        payload = dumps(data)
+        report('pickle %s, 10000 (%d bytes)' % (name, len(payload)),
+               dumps=best('dumps(d)', d=data, dumps=dumps),
+               loads=best('loads(p)', p=payload, loads=loads))
+
+
+def bench_json():
+    from json import dumps, loads
+    from bnum.jsoncodec import BnumEncoder, BnumDecoder
+    cls = explicit(100, fast_attributes=True)
+    data = [{'member': cls[i % 100], 'n': i} for i in range(1000000)]
+    text = dumps(data, cls=BnumEncoder)
+    def hook(obj):
+        obj['member'] = cls(obj['member'])
+        return obj
+    report('json encode, 1000000',
+           codec=best('dumps(d, cls=BnumEncoder)', number=1, repeat=3,
+                      d=data, dumps=dumps, BnumEncoder=BnumEncoder),
+           naive=best('dumps(d, default=lambda m: m.value)', number=1, repeat=3,
+                      d=data, dumps=dumps))
+    report('json decode, 1000000',
+           codec=best('loads(t, cls=BnumDecoder, schema={"member": cls})',
+                      number=1, repeat=3, t=text, loads=loads, cls=cls,
+                      BnumDecoder=BnumDecoder),
+           naive=best('loads(t, object_hook=hook)', number=1, repeat=3,
+                      t=text, loads=loads, hook=hook))
+
+
+def bench_parse():
+    for size in SIZES:
+        classdict = dict(('word%d_x' % i, i) for i in range(size))
+        cls = type(ExplicitBnum)('Words', (ExplicitBnum,), classdict,
+                                 fast_attributes=True)
+        cls.parse('word0_x')  # build the index
+        lower = dict((name.lower(), enum) for name, enum in cls.__members__.items())
+        def naive(text):
+            text = text.strip().lower()
+            if text in lower:
+                return lower[text]
+            matches = [enum for name, enum in lower.items() if name.startswith(text)]
+            if len(matches) == 1:
+                return matches[0]
+            raise ValueError(text)
+        report('parse exact, %d' % size,
+               index=best('cls.parse(" Word1_X ")', number=1000, cls=cls),
+               naive=best('naive(" Word1_X ")', number=1000, naive=naive))
+        report('parse prefix, %d' % size,
+               index=best('cls.parse(" Word1_")', number=1000, cls=cls),
+               naive=best('naive(" Word1_")', number=1, naive=naive))
+
+
+def bench_columns():
+    try:
+        from bnum.columns import decode_column
+    except ImportError:
+        return
+    cls = explicit(100, fast_attributes=True)
+    text = ''.join('%d,n%d,x\n' % (i, i % 100) for i in range(1000000)).encode()
+    def naive(text):
+        return [cls(name=line.split(',')[1]) for line in text.decode().splitlines()]
+    report('decode column, 1000000 lines',
+           columns=best('for chunk in decode_column(cls, t, column=1): pass',
+                        number=1, repeat=3, decode_column=decode_column,
+                        cls=cls, t=text),
+           naive=best('naive(t)', number=1, repeat=3, naive=naive, t=text))
+
+
+def bench_decode_iter():
+    cls = explicit(100, fast_attributes=True)
+    for dirty in (0, 5):
+        values = [0 if i % 100 < dirty else i % 100 + 1 for i in range(100000)]
+        def naive(values):
+            result = []
+            for value in values:
+                try:
+                    result.append(cls(value))
+                except ValueError:
+                    pass
+            return result
+        report('decode %d%% dirty, 100000' % dirty,
+               decode_iter=best('list(cls.decode_iter(v, on_missing="skip"))',
+                                number=1, cls=cls, v=values),
+               naive=best('naive(v)', number=1, naive=naive, v=values))
+
+
+def bench_sort():
+    from operator import attrgetter
+    from bnum import ordinal
+    cls = explicit(1000, value=lambda i: 'v%04d' % i, fast_attributes=True,
+                   ordered=True)
+    members = [cls[i % 1000] for i in Random(0).sample(range(10000), 10000)]
+    report('sorted(members), 10000',
+           ordinal=best('sorted(m, key=key)', number=1, m=members, key=ordinal),
+           value=best('sorted(m, key=key)', number=1, m=members,
+                      key=attrgetter('_value')),
+           ordered=best('sorted(m)', number=1, m=members))
+    report('a < b',
+           ordered=best('a < b', number=1000, a=cls[1], b=cls[2]),
+           value=best('a._value < b._value', number=1000, a=cls[1], b=cls[2]))
+
+
+def bench_open():
+    from bnum.extensible import OpenBnum
+    closed = explicit(1000)
+    extensible = explicit(1000, bases=(OpenBnum,))
+    values = sample(closed)
+    report('Cls(value), open, 1000',
+           open=best('for v in values: cls(v)', cls=extensible,
+                     values=values) / len(values),
+           closed=best('for v in values: cls(v)', cls=closed,
+                       values=values) / len(values))
+    counter = iter(range(2000, 10 ** 9))
+    report('register, 1000',
+           register=best('cls.register("x%d" % next(c), next(c))', number=100,
+                         cls=extensible, c=counter))
+
+
+def bench_get():
+    # accept other spellings (which is slower than a dict lookup)
+    python = type(ExplicitBnum)('Python', (ExplicitBnum,), {
+        '_missing_': classmethod(lambda cls, value:
+                                 cls._enums_by_value.get(
+                                     value.strip().lower().replace('_', ''))
+                                 if isinstance(value, str) else None)})
+    plain = explicit(100, value=lambda i: 'v%d' % i)
+    hooked = explicit(100, value=lambda i: 'v%d' % i, bases=(python, ))
+    cached = explicit(100, value=lambda i: 'v%d' % i, bases=(python, ),
+                      missing_cache=1000)
+    values = ['v%d' % (i % 100) if i % 10 == 0 else 'x%d' % (i % 500)
+              for i in range(10000)]
+    def naive(cls, values):
+        result = []
+        for value in values:
+            try:
+                result.append(cls(value))
+            except ValueError:
+                result.append(None)
+        return result
+    for kind, cls in (('plain', plain), ('_missing_', hooked),
+                      ('cached _missing_', cached)):
+        report('90%% miss, %s, 10000' % kind,
+               get=best('[cls.get(v) for v in values]', number=1,
+                        cls=cls, values=values) / len(values),
+               naive=best('naive(cls, values)', number=1, naive=naive,
+                          cls=cls, values=values) / len(values))
+
+
+def bench_contains():
+    for size in (10, 1000, 10000):
+        cls = explicit(size)
+        member = cls[size - 1]
+        report('member in Cls, %d' % size,
+               contains=best('member in cls', number=1000, cls=cls,
+                             member=member),
+               # the previous behaviour (iterating over the class)
+               scan=best('any(m is member for m in cls)', number=10, cls=cls,
+                         member=member))
+        report('has_value, %d' % size,
+               has_value=best('cls.has_value(size)', number=1000, cls=cls,
+                              size=size),
+               has_name=best('cls.has_name("n0")', number=1000, cls=cls))
+
+
+def bench_index():
+    from bnum.indexes import Index, UniqueIndex
+    def init(self, number, group):
+        self.number, self.group = number, group
+    classdict = dict(('n%d' % i, (i, i % 10)) for i in range(1000))
+    classdict['__init__'] = init
+    cls = type(ExplicitBnum)('Big', (ExplicitBnum,), dict(classdict))
+    classdict.update(by_number=UniqueIndex('number'), by_group=Index('group'))
+    indexed = type(ExplicitBnum)('Big', (ExplicitBnum,), classdict)
+    report('find by attribute, 1000',
+           unique=best('cls.by_number[500]', number=1000, cls=indexed),
+           scan=best('next(m for m in cls if m.number == 500)', number=10,
+                     cls=cls))
+    report('group by attribute, 1000',
+           index=best('cls.by_group[5]', number=1000, cls=indexed),
+           scan=best('[m for m in cls if m.group == 5]', number=10, cls=cls))
+
+
+def bench_range():
+    import numpy as np
+    cls = explicit(1000, value=lambda i: i * 10, fast_attributes=True)
+    def scan(cls, value):
+        found = None
+        for member in cls:
+            if member.value <= value:
+                found = member
+        return found
+    report('Cls.floor(value), 1000',
+           bisect=best('cls.floor(4321)', number=1000, cls=cls),
+           scan=best('scan(cls, 4321)', number=10, cls=cls, scan=scan))
+    readings = Random(0).sample(range(10000), 1000)
+    array = np.array(readings)
+    report('floor of 1000 readings, 1000',
+           locate=best('cls.locate(array)', number=10, cls=cls, array=array),
+           floor=best('[cls.floor(r) for r in readings]', number=10, cls=cls,
+                      readings=readings))
+
+
+def main():
+    bench_call()
+    bench_attributes()
+    bench_iteration()
+    bench_create()
+    bench_set()
+    bench_map()
+    bench_array()
+    bench_layout()
+    bench_hash()
+    bench_pickle()
+    bench_json()
+    bench_parse()
+    bench_columns()
+    bench_decode_iter()
+    bench_sort()
+    bench_open()
+    bench_get()
+    bench_contains()
+    bench_index()
+    bench_range()
+
+
+if __name__ == '__main__':
+    main()
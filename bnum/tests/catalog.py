@@ -0,0 +1,131 @@
+
+from os.path import exists, join
+from pickle import dumps, loads
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bnum.catalog import CatalogBnum, write_catalog
+
+
+'''
+Test enumerations read from catalog files.
+'''
+
+
+class CatalogTest(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def catalog(self, items):
+        path = join(self.directory.name, 'test.bnum')
+        write_catalog(path, items)
+        return path
+
+    def test_lazy(self):
+
+        class Sku(CatalogBnum, catalog=self.catalog(
+                (('widget', 1002), ('gadget', 1001), ('doohickey', 5)))):
+            def describe(self):
+                return 'SKU %d' % self.value
+
+        assert len(Sku) == 3, len(Sku)
+        assert not Sku._materialized
+        assert Sku.widget.describe() == 'SKU 1002', Sku.widget.describe()
+        assert list(Sku._materialized) == [2], Sku._materialized
+        assert Sku.widget is Sku(1002) is Sku['widget'] is Sku(name='widget')
+        assert Sku.widget.name == 'widget'
+        assert Sku.widget._ordinal == 2
+        assert isinstance(Sku.widget, Sku)
+
+    def test_value_cache(self):
+
+        class Number(CatalogBnum, catalog=self.catalog(
+                dict(('n%d' % i, i) for i in range(100)))):
+            pass
+
+        catalog = Number._catalog
+        assert Number(42) is Number.n42
+        assert catalog.ordinals == {42: 42}
+        # a binary search decodes a few records, each once
+        assert 0 < len(catalog.values) < 10, catalog.values
+        decoded = dict(catalog.values)
+        assert Number(42) is Number.n42 and catalog.values == decoded
+        assert Number._enums_by_value.get(43) is Number.n43
+        assert Number._enums_by_value.get(100) is None
+        assert Number.get(100) is None and 100 not in catalog.ordinals
+
+    def test_order(self):
+
+        class Colour(CatalogBnum, catalog=self.catalog(['red', 'green', 'blue'])):
+            pass
+
+        assert [colour.name for colour in Colour] == ['blue', 'green', 'red']
+        assert list(reversed(Colour)) == list(reversed(list(Colour)))
+        assert Colour[0] is Colour.blue
+        assert Colour[-1] is Colour.red
+        assert Colour('green') is Colour.green
+        assert list(Colour.__members__) == ['blue', 'green', 'red']
+        # names are listed without reading the values
+        Colour._catalog.entry = None
+        assert list(Colour._enums_by_name) == ['blue', 'green', 'red']
+
+    def test_unsorted(self):
+
+        class Strange(CatalogBnum, catalog=self.catalog(
+                (('foo', 42), ('bar', 'fish')))):
+            pass
+
+        assert Strange(42) is Strange.foo
+        assert Strange('fish') is Strange.bar
+        assert [strange.name for strange in Strange] == ['foo', 'bar']
+
+    def test_mixin(self):
+
+        class Number(int, CatalogBnum, catalog=self.catalog({'one': 1, 'two': 2})):
+            pass
+
+        assert Number.one + Number.two == 3
+        assert Number(2) is Number.two
+
+    def test_pickle(self):
+
+        class Number(int, CatalogBnum, catalog=self.catalog({'one': 1, 'two': 2})):
+            pass
+
+        assert loads(dumps(Number.two)) is Number.two
+        assert list(Number._materialized) == [1], Number._materialized
+
+    def test_missing(self):
+
+        class Colour(CatalogBnum, catalog=self.catalog(['red'])):
+            pass
+
+        with self.assertRaises(ValueError):
+            Colour('blue')
+        with self.assertRaises(ValueError):
+            Colour(name='blue')
+        with self.assertRaises(AttributeError):
+            Colour.blue
+        with self.assertRaises(KeyError):
+            Colour['blue']
+        with self.assertRaises(IndexError):
+            Colour[1]
+
+    def test_duplicates(self):
+        with self.assertRaises(ValueError):
+            self.catalog((('a', 1), ('b', 1)))
+
+    def test_reserved(self):
+        for name in ('get', 'parse', '_materialize', '__doc__'):
+            with self.assertRaisesRegex(ValueError, name):
+                self.catalog(['ok', name])
+        assert not exists(join(self.directory.name, 'test.bnum'))
+
+    def test_no_instances_in_class(self):
+        with self.assertRaises(TypeError):
+            class Colour(CatalogBnum, catalog=self.catalog(['red'])):
+                blue = 'blue'
@@ -0,0 +1,71 @@
+
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from bnum import ImplicitBnum, ExplicitBnum, from_one
+from bnum.columns import decode_column, decode_file
+
+
+'''
+Test decoding columns of delimited text.
+'''
+
+
+class Weekday(ImplicitBnum, values=from_one):
+    monday, tuesday, wednesday, thursday, friday
+    saturday, sunday
+
+
+class Status(ExplicitBnum):
+    ok = 200
+    missing = 404
+
+
+TEXT = b'1,monday,200\n2,sunday,404\n3,funday,200\r\n4\n5,friday,999'
+
+
+class DecodeColumnTest(TestCase):
+
+    def decode(self, text, **kargs):
+        chunks = list(decode_column(kargs.pop('cls', Weekday), text, **kargs))
+        return (np.concatenate([chunk.ordinals for chunk in chunks]).tolist(),
+                np.concatenate([chunk.unknown for chunk in chunks]).tolist())
+
+    def test_names(self):
+        ordinals, unknown = self.decode(TEXT, column=1)
+        assert ordinals == [0, 6, -1, -1, 4], ordinals
+        assert unknown == [TEXT.index(b'funday'), TEXT.index(b'\n4\n') + 1], unknown
+
+    def test_values(self):
+        ordinals, unknown = self.decode(TEXT, cls=Status, column=2, by_name=False)
+        assert ordinals == [0, 1, 0, -1, -1], ordinals
+        assert unknown == [TEXT.index(b'\n4\n') + 1, TEXT.index(b'999')], unknown
+
+    def test_chunks(self):
+        for chunk_size in (1, 5, 13, 100):
+            ordinals, unknown = self.decode(TEXT, column=1, chunk_size=chunk_size)
+            assert ordinals == [0, 6, -1, -1, 4], (chunk_size, ordinals)
+            assert len(unknown) == 2
+
+    def test_prefix(self):
+        # a token is not matched by a longer name, or a longer token by a name
+        ordinals, _ = self.decode(b'mon\nmondays\nmonday\n')
+        assert ordinals == [-1, -1, 0], ordinals
+
+    def test_compact(self):
+        chunk = next(decode_column(Weekday, memoryview(b'monday\n')))
+        assert chunk.ordinals.dtype == np.int8
+
+    def test_file(self):
+        with TemporaryDirectory() as directory:
+            path = join(directory, 'days.csv')
+            with open(path, 'wb') as output:
+                output.write(b'tuesday\n' * 1000)
+            ordinals = np.concatenate([chunk.ordinals for chunk in
+                                       decode_file(Weekday, path, chunk_size=100)])
+            assert (ordinals == 1).all() and len(ordinals) == 1000
+            open(path, 'wb').close()
+            assert list(decode_file(Weekday, path)) == []
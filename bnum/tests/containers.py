@@ -0,0 +1,142 @@
+
+from pickle import dumps, loads
+from unittest import TestCase
+
+from bnum import ImplicitBnum, from_one
+from bnum.containers import BnumSet, BnumMap
+
+
+'''
+Test the containers specialised for Bnum instances.
+'''
+
+
+class Colour(ImplicitBnum):
+    red
+    green
+    blue
+    cyan
+    magenta
+    yellow
+
+
+class Weekday(ImplicitBnum, values=from_one):
+    monday, tuesday, wednesday, thursday, friday
+    saturday, sunday
+
+
+class BnumSetTest(TestCase):
+
+    def test_basic(self):
+        colours = BnumSet(Colour, [Colour.red, Colour.blue])
+        assert Colour.red in colours
+        assert Colour.green not in colours
+        assert Weekday.monday not in colours
+        assert 'red' not in colours
+        assert len(colours) == 2, len(colours)
+        colours.add(Colour.green)
+        colours.add(Colour.green)
+        assert len(colours) == 3, len(colours)
+        colours.remove(Colour.red)
+        colours.discard(Colour.red)
+        colours.discard(Weekday.monday)
+        assert set(colours) == {Colour.blue, Colour.green}
+        with self.assertRaises(KeyError):
+            colours.remove(Colour.red)
+        with self.assertRaises(TypeError):
+            colours.add(Weekday.monday)
+        colours.clear()
+        assert not colours
+
+    def test_order(self):
+        colours = BnumSet(Colour, [Colour.yellow, Colour.red, Colour.blue])
+        assert list(colours) == [Colour.blue, Colour.red, Colour.yellow]
+        assert colours.mask == 0b110001, bin(colours.mask)
+
+    def test_operators(self):
+        rgb = BnumSet(Colour, [Colour.red, Colour.green, Colour.blue])
+        cmy = BnumSet(Colour, [Colour.cyan, Colour.magenta, Colour.yellow])
+        red = BnumSet(Colour, [Colour.red])
+        assert len(rgb | cmy) == 6
+        assert not rgb & cmy
+        assert rgb & red == red
+        assert rgb - red == BnumSet(Colour, [Colour.green, Colour.blue])
+        assert rgb ^ red == rgb - red
+        assert red <= rgb and red < rgb and rgb >= red and rgb > red
+        assert not rgb < rgb and rgb <= rgb
+        assert rgb.isdisjoint(cmy)
+        assert rgb == {Colour.red, Colour.green, Colour.blue}
+        assert rgb | {Colour.cyan} == rgb | BnumSet(Colour, [Colour.cyan])
+        assert isinstance(rgb | {Colour.cyan}, BnumSet)
+        both = rgb.copy()
+        both |= cmy
+        assert len(both) == 6 and len(rgb) == 3
+        both -= rgb
+        assert both == cmy
+        both &= red
+        assert not both
+        both ^= red
+        assert both == red
+
+    def test_from_mask(self):
+        days = BnumSet.from_mask(Weekday, 0b1000001)
+        assert list(days) == [Weekday.monday, Weekday.sunday]
+        assert BnumSet(Weekday, days).mask == days.mask
+
+
+class BnumMapTest(TestCase):
+
+    def test_basic(self):
+        counts = BnumMap(Colour)
+        assert not counts
+        counts[Colour.red] = 1
+        counts[Colour.blue] = 2
+        counts[Colour.red] += 1
+        assert len(counts) == 2, len(counts)
+        assert counts[Colour.red] == 2
+        assert Colour.red in counts and Colour.green not in counts
+        assert Weekday.monday not in counts
+        assert counts.get(Colour.green) is None
+        assert counts.get(Weekday.monday, 0) == 0
+        with self.assertRaises(KeyError):
+            counts[Colour.green]
+        with self.assertRaises(KeyError):
+            counts[Weekday.monday] = 1
+        del counts[Colour.red]
+        assert len(counts) == 1
+        with self.assertRaises(KeyError):
+            del counts[Colour.red]
+        assert counts.pop(Colour.blue) == 2
+        assert not counts
+
+    def test_order(self):
+        days = BnumMap(Weekday, {Weekday.sunday: 'rest', Weekday.monday: 'work'})
+        assert list(days) == [Weekday.monday, Weekday.sunday]
+        assert list(days.values()) == ['work', 'rest']
+        assert days == {Weekday.monday: 'work', Weekday.sunday: 'rest'}
+        days.setdefault(Weekday.friday, 'party')
+        assert list(days.items())[1] == (Weekday.friday, 'party')
+        copy = days.copy()
+        copy.clear()
+        assert len(days) == 3 and not copy
+
+    def test_none(self):
+        values = BnumMap(Colour, [(Colour.red, None)])
+        assert Colour.red in values
+        assert values[Colour.red] is None
+
+
+class PickleTest(TestCase):
+
+    def test_set(self):
+        weekend = BnumSet(Weekday, [Weekday.saturday, Weekday.sunday])
+        copy = loads(dumps(weekend))
+        assert copy == weekend and copy is not weekend
+        assert copy.mask == weekend.mask
+
+    def test_map(self):
+        hours = BnumMap(Weekday, {Weekday.monday: 8, Weekday.sunday: 0})
+        copy = loads(dumps(hours))
+        assert copy == hours, copy
+        assert list(copy) == [Weekday.monday, Weekday.sunday]
+        assert Weekday.tuesday not in copy
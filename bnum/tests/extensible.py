@@ -0,0 +1,149 @@
+
+from pickle import dumps, loads
+from threading import Thread
+from unittest import TestCase
+
+from bnum import from_one
+from bnum.containers import BnumMap, BnumSet
+from bnum.extensible import OpenBnum
+
+
+'''
+Test Bnum classes that can gain instances after creation.
+'''
+
+
+class Status(OpenBnum):
+    ok = 200
+    not_found = 404
+
+
+class OpenBnumTest(TestCase):
+
+    def test_register(self):
+
+        class Code(OpenBnum):
+            b = 2
+            a = 1
+
+        a, b = Code.a, Code.b
+        c = Code.register('c', 0)
+        assert Code.c is c and Code(0) is c and Code(0, 'c') is c
+        assert Code['c'] is c and Code.__members__['c'] is c
+        assert Code.a is a and a._ordinal == 0 and b._ordinal == 1
+        assert c._ordinal == 2 and Code[2] is c
+        assert list(Code) == [a, b, c] and len(Code) == 3
+        assert Code.parse('C') is c
+
+    def test_repeat(self):
+
+        class Code(OpenBnum):
+            a = 1
+
+        b = Code.register('b', 2)
+        assert Code.register('b', 2) is b and Code.register('b') is b
+        with self.assertRaises(ValueError):
+            Code.register('b', 3)
+        with self.assertRaises(ValueError):
+            Code.register('c', 1)
+        for name in ('register', '__x__', 'parse'):
+            with self.assertRaises(ValueError):
+                Code.register(name, 9)
+        assert len(Code) == 2
+
+    def test_implicit(self):
+
+        class Code(OpenBnum, values=from_one):
+            with implicit:
+                a, b
+
+        c = Code.register('c')
+        assert c.value == 3 and Code(3) is c
+
+        class Name(OpenBnum):
+            a = 'a'
+
+        assert Name.register('b').value == 'b'
+
+    def test_empty(self):
+
+        class Code(int, OpenBnum, slots=False):
+            pass
+
+        one = Code.register('one', 1)
+        assert one == 1 and Code(1) is one and Code.one is one
+
+        class Compact(OpenBnum, slots=True):
+            pass
+
+        x = Compact.register('x', 'x')
+        assert not hasattr(x, '__dict__') and x.value == 'x'
+
+    def test_cannot_extend(self):
+
+        class Code(OpenBnum):
+            pass
+
+        class Other(Code):
+            pass
+
+        Code.register('a', 1)
+        with self.assertRaises(TypeError):
+            class Another(Code):
+                pass
+
+    def test_base_class(self):
+        with self.assertRaisesRegex(TypeError, 'subclasses of OpenBnum'):
+            OpenBnum.register('a', 1)
+
+    def test_containers(self):
+
+        class Code(OpenBnum):
+            a = 1
+
+        bnum_map, bnum_set = BnumMap(Code, {Code.a: 'a'}), BnumSet(Code)
+        b = Code.register('b', 2)
+        assert b not in bnum_map and bnum_map.get(b) is None
+        bnum_map[b] = 'b'
+        bnum_set.add(b)
+        assert bnum_map[b] == 'b' and list(bnum_map) == [Code.a, b]
+        assert list(bnum_set) == [b]
+
+    def test_pickle(self):
+        ok = loads(dumps(Status.ok))
+        assert ok is Status.ok
+        teapot = Status.register('teapot', 418)
+        data = dumps(teapot)
+        assert loads(data) is teapot
+
+    def test_concurrent(self):
+
+        class Code(OpenBnum):
+            zero = 0
+
+        zero, errors = Code.zero, []
+
+        def write(start):
+            for i in range(start, start + 200):
+                Code.register('n%d' % i, i)
+
+        def read():
+            try:
+                for _ in range(2000):
+                    assert Code(0) is zero and Code.zero is zero
+                    members = list(Code)
+                    assert members[0] is zero
+                    assert [m._ordinal for m in members] == \
+                           list(range(len(members)))
+            except AssertionError as error:
+                errors.append(error)
+
+        threads = [Thread(target=write, args=(1 + 200 * i, )) for i in range(4)]
+        threads += [Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, errors
+        assert len(Code) == 801 and len(set(Code._enums_by_value)) == 801
+        assert all(Code(i).name == 'n%d' % i for i in range(1, 801))
@@ -1,6 +1,13 @@
 
+from copy import copy, deepcopy
+from decimal import Decimal
+from gc import collect
+from pickle import dumps, loads
 from unittest import TestCase
-from bnum import ImplicitBnum, ExplicitBnum, from_one
+from weakref import ref
+from bnum import ImplicitBnum, ExplicitBnum, BnumLookupMeta, from_one, bits, \
+    add_hook, remove_hook, HOOKS, CLASS_STARTED, MEMBER_CREATED, \
+    ALIAS_RESOLVED, UNSORTED_VALUES, CLASS_FINISHED, ordinal
 
 
 '''
@@ -63,3 +70,659 @@ class ImplicitTest(TestCase):
         assert Baf.explicit in Baf
         assert repr(Baf.implicit) == "Baf(value=1, name='implicit')", repr(Baf.implicit)
 
+
+
+class IntegerValueTest(TestCase):
+
+    def test_counter(self):
+
+        class Weekday(ImplicitBnum, values=from_one):
+            monday, tuesday, wednesday
+
+        assert Weekday(3) is Weekday.wednesday
+        assert Weekday(True) is Weekday.monday
+        assert Weekday(1.0) is Weekday.monday
+        for value in (-1, 0, 4, 100):
+            with self.assertRaises(ValueError):
+                Weekday(value)
+
+    def test_bits(self):
+
+        class Emphasis(ImplicitBnum, values=bits):
+            underline, italic, bold, strike, blink, reverse
+
+        class Sparse(ExplicitBnum):
+            zero = 0
+            one = 1
+            big = 2 ** 20
+
+        for cls in (Emphasis, Sparse):
+            for enum in cls:
+                assert cls(enum.value) is enum
+        for value in (3, 5, 64, -4):
+            with self.assertRaises(ValueError):
+                Emphasis(value)
+
+    def test_sparse(self):
+
+        class Sparse(ExplicitBnum):
+            a = 3
+            b = 1000
+
+        class Mixed(ExplicitBnum):
+            a = 1
+            b = 'two'
+
+        assert Sparse(1000) is Sparse.b
+        assert Mixed(1) is Mixed.a
+
+
+class FunctionalTest(TestCase):
+
+    def test_arguments(self):
+        Number = ExplicitBnum('Number', {'one': 1}, type=int, slots=True)
+        assert Number.one + 1 == 2 and Number(1) is Number.one
+        with self.assertRaises(ValueError):
+            ExplicitBnum(1, 'x')
+        with self.assertRaises(TypeError):
+            ExplicitBnum('Number', 'one', colour='red')
+        # keywords are only for creating classes
+        with self.assertRaises(TypeError):
+            Number(1, modul='x')
+        with self.assertRaises(TypeError):
+            Number(name='one', type=int)
+
+
+class FastAttributesTest(TestCase):
+
+    def test_fast(self):
+
+        class Colour(ImplicitBnum, fast_attributes=True):
+            red
+            green
+
+        assert 'red' in Colour.__dict__
+        assert not isinstance(Colour, BnumLookupMeta)
+        assert Colour.red is Colour('red') is Colour['red']
+        assert Colour.red.name == 'red', Colour.red.name
+        assert Colour.red.value == 'red', Colour.red.value
+        with self.assertRaises(AttributeError):
+            Colour.red.name = 'blue'
+        with self.assertRaises(AttributeError):
+            Colour.blue
+        assert list(Colour) == [Colour.green, Colour.red]
+
+    def test_aliases(self):
+
+        class Season(ExplicitBnum, allow_aliases=True, fast_attributes=True):
+            autumn = 3
+            fall = 3
+
+        assert Season.fall is Season.autumn
+        assert Season.fall.name == 'autumn'
+
+    def test_instance_attributes(self):
+        # documented: with fast_attributes, instances see each other (as
+        # class attributes); by default they do not
+
+        class Fast(ImplicitBnum, fast_attributes=True):
+            red
+            blue
+
+        class Default(ImplicitBnum):
+            red
+            blue
+
+        assert Fast.red.blue is Fast.blue
+        with self.assertRaises(AttributeError):
+            Default.red.blue
+
+    def test_clash(self):
+
+        class Huh(ExplicitBnum, fast_attributes=True):
+            name = 1
+            value = 2
+
+        assert isinstance(Huh, BnumLookupMeta)
+        assert Huh.name.name == 'name', Huh.name.name
+        assert Huh.value.value == 2, Huh.value.value
+
+    def test_default(self):
+
+        class Colour(ImplicitBnum):
+            red
+
+        assert 'red' not in Colour.__dict__
+        assert isinstance(Colour, BnumLookupMeta)
+        assert not isinstance(ImplicitBnum, BnumLookupMeta)
+
+
+class SlotsTest(TestCase):
+
+    def test_slots(self):
+
+        class Colour(ImplicitBnum, slots=True):
+            red
+            green
+
+        assert not hasattr(Colour.red, '__dict__')
+        assert Colour.red.name == 'red', Colour.red.name
+        assert Colour.red.value == 'red', Colour.red.value
+        assert Colour('green') is Colour.green
+        with self.assertRaises(AttributeError):
+            Colour.red.name = 'blue'
+        with self.assertRaises(AttributeError):
+            Colour.red.colour = 'red'
+
+    def test_mixins(self):
+
+        class Fruit(str, ExplicitBnum, slots=True):
+            apple = 'apple'
+
+        class Number(int, ExplicitBnum, slots=True):
+            one = 1
+
+        assert not hasattr(Fruit.apple, '__dict__')
+        assert Fruit.apple.value == 'apple' and Fruit.apple.upper() == 'APPLE'
+        # int does not support slots, so this falls back to a dict
+        assert hasattr(Number.one, '__dict__')
+        assert Number.one.value == 1 and Number.one + 1 == 2
+
+    def test_declared(self):
+
+        class Planet(ExplicitBnum, slots=True):
+            __slots__ = ('mass', )
+            mercury = 3.303e+23
+            venus = 4.869e+24
+            def __init__(self, mass):
+                self.mass = mass
+
+        assert Planet.venus.mass == 4.869e+24
+
+    def test_conflict(self):
+
+        class Field(ExplicitBnum, slots=True):
+            name = 1
+            size = 2
+
+        assert Field.name.value == 1
+        assert Field.size.name == 'size'
+
+    def test_functional(self):
+        Colour = ImplicitBnum('Colour', 'red green', slots=True)
+        assert not hasattr(Colour.red, '__dict__')
+
+
+class HashTest(TestCase):
+
+    def test_plain(self):
+
+        class Colour(ImplicitBnum):
+            red
+            green
+
+        assert Colour.red == Colour.red and not Colour.red != Colour.red
+        assert Colour.red != Colour.green and not Colour.red == Colour.green
+        assert Colour.red != 'red'
+        assert hash(Colour.red) == hash(Colour('red'))
+        assert {Colour.red: 1}[Colour['red']] == 1
+        assert len({Colour.red, Colour.green, Colour.red}) == 2
+
+    def test_mixins(self):
+
+        class Number(int, ExplicitBnum):
+            one = 1
+
+        class Fruit(str, ExplicitBnum):
+            apple = 'apple'
+
+        class Weight(float, ExplicitBnum, slots=True):
+            light = 0.5
+
+        for member, value in ((Number.one, 1), (Fruit.apple, 'apple'),
+                              (Weight.light, 0.5)):
+            assert member == value and value == member, member
+            assert hash(member) == hash(value), member
+            assert {value: 1}[member] == 1, member
+
+
+class PickleTest(TestCase):
+
+    def test_local(self):
+
+        class Animal(ExplicitBnum):
+            pig = 4, 'oink'
+            cow = 4, 'moo'
+
+        class Number(int, ExplicitBnum):
+            one = 1
+
+        assert loads(dumps(Animal.pig)) is Animal.pig
+        assert loads(dumps(Animal)) is Animal
+        assert loads(dumps(Number.one)) is Number.one
+        assert copy(Animal.cow) is deepcopy(Animal.cow) is Animal.cow
+
+    def test_compact(self):
+
+        class Animal(ExplicitBnum, slots=True):
+            pig = 4, 'oink'
+            cow = 4, 'moo'
+
+        herd = [Animal.pig, Animal.cow] * 1000
+        payload = dumps(herd)
+        assert loads(payload) == herd
+        # the class and the values are not repeated
+        assert payload.count(b'Animal') == 1, payload
+        assert b'oink' not in payload, payload
+        assert len(payload) < 4 * len(herd), len(payload)
+
+
+class MembersTest(TestCase):
+
+    def test_sequence(self):
+
+        class Season(ExplicitBnum, allow_aliases=True):
+            spring = 1
+            summer = 2
+            autumn = 3
+            fall = 3
+            winter = 4
+
+        assert Season._members == (Season.spring, Season.summer,
+                                   Season.autumn, Season.winter)
+        assert list(Season) == list(Season._members)
+        assert list(reversed(Season)) == list(reversed(Season._members))
+        assert len(Season) == 4, len(Season)
+        assert Season[0] is Season.spring
+        assert Season[-1] is Season.winter
+        assert Season[Season.fall._ordinal] is Season.autumn
+        assert Season['fall'] is Season.autumn
+        with self.assertRaises(IndexError):
+            Season[4]
+        with self.assertRaises(KeyError):
+            Season['monsoon']
+
+    def test_members(self):
+
+        class Colour(ImplicitBnum):
+            red
+            green
+
+        assert Colour.__members__ is Colour.__members__
+        assert list(Colour.__members__) == ['red', 'green']
+        with self.assertRaises(TypeError):
+            Colour.__members__['blue'] = None
+
+    def test_empty(self):
+        assert len(ExplicitBnum) == 0
+        assert list(ExplicitBnum) == []
+        assert list(reversed(ImplicitBnum)) == []
+
+
+class OrderedTest(TestCase):
+
+    def test_key(self):
+
+        class Strange(ExplicitBnum):
+            foo = 42
+            bar = 'fish'
+            baz = None
+
+        members = [Strange.baz, Strange.foo, Strange.bar, Strange.foo]
+        assert sorted(members, key=ordinal) == \
+               [Strange.foo, Strange.foo, Strange.bar, Strange.baz]
+        with self.assertRaises(TypeError):
+            Strange.foo < Strange.bar
+
+    def test_ordered(self):
+
+        class Strange(ExplicitBnum, ordered=True):
+            foo = 42
+            bar = 'fish'
+            baz = None
+
+        assert Strange.foo < Strange.bar <= Strange.bar < Strange.baz
+        assert Strange.baz > Strange.foo and Strange.baz >= Strange.baz
+        assert not Strange.bar < Strange.foo
+        assert sorted([Strange.baz, Strange.bar, Strange.foo]) == list(Strange)
+        assert max(Strange) is Strange.baz
+        with self.assertRaises(TypeError):
+            Strange.foo < 43
+
+    def test_other_class(self):
+
+        class Colour(ImplicitBnum, ordered=True):
+            red
+            blue
+
+        class Other(ImplicitBnum, ordered=True):
+            red
+
+        assert Colour.blue < Colour.red
+        with self.assertRaises(TypeError):
+            Colour.red < Other.red
+
+    def test_mixin(self):
+
+        class Number(int, ExplicitBnum, ordered=True):
+            two = 2
+            one = 1
+
+        assert Number.one < Number.two and Number.one < 2 and 0 < Number.one
+        assert sorted([2, Number.two, Number.one, 0]) == [0, 1, 2, 2]
+
+    def test_declared(self):
+
+        class Reversed(ImplicitBnum, ordered=True):
+            a
+            b
+            def __lt__(self, other):
+                return self._ordinal > other._ordinal
+
+        assert Reversed.b < Reversed.a and Reversed.a <= Reversed.b
+
+    def test_functional(self):
+        Colour = ImplicitBnum('Colour', 'red green blue', ordered=True)
+        assert Colour.blue < Colour.green < Colour.red
+
+
+class GetTest(TestCase):
+
+    def test_get(self):
+
+        class Colour(ImplicitBnum):
+            red
+            green
+
+        assert Colour.get('red') is Colour.red
+        assert Colour.get(Colour.red) is Colour.red
+        assert Colour.get(name='green') is Colour.green
+        assert Colour.get('red', 'red') is Colour.red
+        assert Colour.get('blue') is None
+        assert Colour.get('blue', default=Colour.red) is Colour.red
+        assert Colour.get('red', 'green') is None
+        assert Colour.get(name='blue') is None
+        assert Colour.get([1]) is None
+        assert Colour.get() is None
+
+    def test_dense(self):
+
+        class Number(ExplicitBnum):
+            one = 1
+            two = 2
+
+        assert Number.get(2) is Number.two and Number.get(3) is None
+
+    def test_quiet(self):
+        from contextlib import redirect_stdout
+        from io import StringIO
+
+        class Colour(ImplicitBnum):
+            red
+
+        with redirect_stdout(StringIO()) as output:
+            with self.assertRaises(ValueError):
+                Colour(name='blue')
+        assert not output.getvalue(), output.getvalue()
+
+
+class MissingTest(TestCase):
+
+    def test_missing(self):
+
+        class Colour(ExplicitBnum):
+            red = 'red'
+            grey = 'grey'
+            @classmethod
+            def _missing_(cls, value):
+                if isinstance(value, str) and value.lower() != value:
+                    return cls.get(value.lower())
+                if value == 'gray':
+                    return cls.grey
+
+        assert Colour('RED') is Colour.red and Colour('gray') is Colour.grey
+        assert Colour.get('Grey') is Colour.grey
+        assert Colour.get('blue') is None
+        with self.assertRaises(ValueError):
+            Colour('blue')
+
+    def test_dense(self):
+
+        class Number(ExplicitBnum):
+            one = 1
+            two = 2
+            @classmethod
+            def _missing_(cls, value):
+                if isinstance(value, int):
+                    return cls.two
+
+        assert Number(5) is Number.two and Number.get(-1) is Number.two
+
+    def test_cache(self):
+        calls = []
+
+        class Colour(ExplicitBnum, missing_cache=2):
+            red = 'red'
+            @classmethod
+            def _missing_(cls, value):
+                calls.append(value)
+                return cls.red if value == 'RED' else None
+
+        for _ in range(3):
+            assert Colour('RED') is Colour.red
+            assert Colour.get('blue') is None
+        assert calls == ['RED', 'blue'], calls
+        Colour.get('green')  # forgets RED
+        assert Colour.get('RED') is Colour.red
+        assert calls == ['RED', 'blue', 'green', 'RED'], calls
+        assert Colour.get([1]) is None  # unhashable, not cached
+        assert len(Colour._missing_cache) == 2
+
+    def test_cache_race(self):
+        # another thread may remove the oldest entry (or change the cache)
+        # between finding it and removing it
+
+        class Number(ExplicitBnum, missing_cache=2):
+            zero = 0
+            @classmethod
+            def _missing_(cls, value):
+                return cls.zero
+
+        class Removed(dict):
+            def __iter__(self):
+                oldest = next(super().__iter__())
+                del self[oldest]
+                yield oldest
+
+        class Changed(dict):
+            def __iter__(self):
+                raise RuntimeError('dictionary changed size during iteration')
+
+        for cache in Removed(), Changed():
+            Number._missing_cache = cache
+            for value in range(1, 5):
+                assert Number(value) is Number.zero
+        assert len(cache) == 4  # nothing removed while changing
+
+    def test_bad_result(self):
+
+        class Colour(ExplicitBnum):
+            red = 'red'
+            @classmethod
+            def _missing_(cls, value):
+                return 'red'
+
+        with self.assertRaises(TypeError):
+            Colour.get('blue')
+
+    def test_functional(self):
+        Colour = ImplicitBnum('Colour', 'red', missing_cache=10)
+        assert Colour._missing_cache is not None
+        assert Colour.get('blue') is None
+
+
+class ContainsTest(TestCase):
+
+    def test_contains(self):
+
+        class Season(ExplicitBnum, allow_aliases=True):
+            spring = 1
+            autumn = 3
+            fall = 3
+
+        class Other(ExplicitBnum):
+            spring = 1
+
+        assert Season.spring in Season and Season.fall in Season
+        assert Other.spring not in Season and Season.spring not in Other
+        assert 1 not in Season and 'spring' not in Season
+        assert [1] not in Season and None not in Season
+
+    def test_mixin(self):
+
+        class Number(int, ExplicitBnum):
+            one = 1
+
+        assert Number.one in Number and 1 not in Number
+        assert Number.has_value(1) and not Number.has_value(2)
+
+    def test_has(self):
+
+        class Season(ExplicitBnum, allow_aliases=True):
+            spring = 1
+            autumn = 3
+            fall = 3
+
+        assert Season.has_value(3) and not Season.has_value(2)
+        assert Season.has_name('fall') and not Season.has_name('winter')
+        assert not Season.has_value([1]) and not Season.has_name({})
+        assert not Season.has_name(1) and not Season.has_value('spring')
+
+
+class HooksTest(TestCase):
+
+    def events(self, build):
+        events = []
+        add_hook(events.append)
+        try:
+            build()
+        finally:
+            remove_hook(events.append)
+        return events
+
+    def test_events(self):
+
+        def build():
+            class Season(ExplicitBnum, allow_aliases=True):
+                spring = 1
+                autumn = 3
+                fall = 3
+
+        events = self.events(build)
+        assert [event.kind for event in events] == \
+               [CLASS_STARTED, MEMBER_CREATED, MEMBER_CREATED,
+                ALIAS_RESOLVED, CLASS_FINISHED], events
+        assert all(event.cls.endswith('Season') for event in events)
+        assert events[1].name == 'spring' and events[1].value == 1, events[1]
+        assert events[3].name == 'fall' and events[3].value == 'autumn'
+        assert events[-1].elapsed >= sum(event.elapsed for event in events[1:4])
+        assert events == sorted(events, key=lambda event: event.time)
+
+    def test_unsorted(self):
+
+        def build():
+            class Strange(ExplicitBnum):
+                foo = 42
+                bar = 'fish'
+
+        events = self.events(build)
+        assert UNSORTED_VALUES in [event.kind for event in events], events
+
+    def test_quiet(self):
+        from contextlib import redirect_stdout
+        from io import StringIO
+        with redirect_stdout(StringIO()) as output:
+            class Colour(ImplicitBnum):
+                red
+        assert not output.getvalue(), output.getvalue()
+        assert not HOOKS
+
+
+class ConstructionTest(TestCase):
+
+    def test_contents(self):
+
+        class Descriptor:
+            def __get__(self, instance, owner):
+                return 42
+
+        class Colour(ExplicitBnum):
+            red = 1
+            green = 2
+            answer = Descriptor()
+            def double(self):
+                return 2 * self.value
+            @property
+            def half(self):
+                return self.value / 2
+
+        assert len(Colour) == 2, list(Colour)
+        assert Colour.answer == 42
+        assert Colour.green.double() == 4 and Colour.green.half == 1
+        assert list(Colour._enums_by_value) == [1, 2]
+
+    def test_order(self):
+
+        class Number(ExplicitBnum):
+            three = 3
+            one = 1
+            two = 2
+
+        assert list(Number) == [Number.one, Number.two, Number.three]
+        assert [n._ordinal for n in Number] == [0, 1, 2]
+        assert list(Number._enums_by_name) == ['three', 'one', 'two']
+
+    def test_uncomparable(self):
+        # any error from sorting leaves the values in definition order
+
+        class Number(ExplicitBnum):
+            nan = Decimal('NaN')
+            one = Decimal(1)
+
+        assert list(Number) == [Number.nan, Number.one]
+
+    def test_shared_bases(self):
+        # the mixins and __new__ for each set of bases are cached
+
+        class Number(int, ExplicitBnum):
+            one = 1
+
+        class Other(int, ExplicitBnum):
+            two = 2
+
+        class Plain(ExplicitBnum):
+            three = 3
+
+        assert Number.one + 1 == 2 and Other.two + 1 == 3
+        assert Plain.three.value == 3 and not isinstance(Plain.three, int)
+
+    def test_collected(self):
+        # the caches do not keep classes created at runtime alive
+        Base = ExplicitBnum('Base', ())
+        Number = Base('Number', {'one': 1}, type=int)
+        assert Number.one + 1 == 2
+        classes = ref(Base), ref(Number)
+        del Base, Number
+        collect()
+        assert classes[0]() is None and classes[1]() is None
+
+    def test_init(self):
+
+        class Planet(ExplicitBnum):
+            mercury = (3.3e23, 2.4e6)
+            venus = (4.9e24, 6.1e6)
+            def __init__(self, mass, radius):
+                self.mass = mass
+
+        assert Planet.venus.mass == 4.9e24
+        assert Planet.venus.value == (4.9e24, 6.1e6)
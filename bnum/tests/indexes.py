@@ -0,0 +1,102 @@
+
+from unittest import TestCase
+
+from bnum import ExplicitBnum
+from bnum.extensible import OpenBnum
+from bnum.indexes import Index, UniqueIndex
+
+
+'''
+Test secondary indexes.
+'''
+
+
+class Animal(ExplicitBnum):
+
+    by_noise = UniqueIndex('noise')
+    by_legs = Index('legs')
+
+    def __init__(self, legs, noise):
+        self.legs = legs
+        self.noise = noise
+
+    pig = 4, 'oink'
+    hen = 2, 'cluck'
+    cow = 4, 'moo'
+
+
+class IndexTest(TestCase):
+
+    def test_unique(self):
+        assert Animal.by_noise['moo'] is Animal.cow
+        assert Animal.by_noise.get('moo') is Animal.cow
+        assert Animal.by_noise.get('baa') is None
+        assert 'oink' in Animal.by_noise and 'baa' not in Animal.by_noise
+        assert len(Animal.by_noise) == 3
+        with self.assertRaises(KeyError):
+            Animal.by_noise['baa']
+
+    def test_group(self):
+        # in the class's order (by value)
+        assert Animal.by_legs[4] == (Animal.cow, Animal.pig)
+        assert Animal.by_legs[2] == (Animal.hen, )
+        assert Animal.by_legs.get(3) == ()
+        assert sorted(Animal.by_legs) == [2, 4]
+        assert dict(Animal.by_legs) == {2: (Animal.hen, ),
+                                        4: (Animal.cow, Animal.pig)}
+
+    def test_not_members(self):
+        assert len(Animal) == 3
+        assert Animal.pig.by_legs is Animal.by_legs
+
+    def test_name_value(self):
+
+        class Colour(ExplicitBnum, fast_attributes=True):
+            by_value = UniqueIndex('value')
+            red = 1
+            green = 2
+
+        assert Colour.by_value[2] is Colour.green
+
+    def test_duplicate(self):
+        with self.assertRaises(ValueError):
+            class Bad(ExplicitBnum):
+                by_noise = UniqueIndex('noise')
+                def __init__(self, legs, noise):
+                    self.noise = noise
+                dog = 4, 'woof'
+                seal = 0, 'woof'
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            class Bad(ExplicitBnum):
+                by_tags = Index('tags')
+                def __init__(self, *tags):
+                    self.tags = list(tags)
+                a = 1, 2
+
+    def test_shared(self):
+        index = Index('value')
+
+        class Once(ExplicitBnum):
+            by_value = index
+            a = 1
+
+        with self.assertRaises(TypeError):
+            class Twice(ExplicitBnum):
+                by_value = index
+                a = 1
+
+    def test_open(self):
+
+        class Code(OpenBnum):
+            by_text = UniqueIndex('text')
+            def __init__(self, number, text):
+                self.text = text
+            ok = 200, 'OK'
+
+        teapot = Code.register('teapot', (418, "I'm a teapot"))
+        assert Code.by_text["I'm a teapot"] is teapot
+        with self.assertRaises(ValueError):
+            Code.register('fine', (201, 'OK'))
+        assert not Code.has_name('fine') and len(Code) == 2
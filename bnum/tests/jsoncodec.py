@@ -0,0 +1,70 @@
+
+from json import dumps, loads
+from unittest import TestCase
+
+from bnum import ImplicitBnum, ExplicitBnum, from_one
+from bnum.jsoncodec import BnumEncoder, BnumDecoder
+
+
+'''
+Test the JSON encoder and decoder.
+'''
+
+
+class Colour(ImplicitBnum):
+    red
+    green
+    blue
+
+
+class Weekday(ImplicitBnum, values=from_one):
+    monday, tuesday, wednesday, thursday, friday
+    saturday, sunday
+
+
+class Number(int, ExplicitBnum):
+    one = 1
+    two = 2
+
+
+class Animal(ExplicitBnum):
+    pig = 4, 'oink'
+    duck = 2, 'quack'
+
+
+class JsonTest(TestCase):
+
+    def test_round_trip(self):
+        data = [{'colour': Colour.red, 'day': Weekday.friday, 'n': 1},
+                {'colour': Colour.blue, 'day': Weekday.monday, 'n': 2}]
+        text = dumps(data, cls=BnumEncoder)
+        assert text == '[{"colour": "red", "day": 5, "n": 1}, ' \
+                       '{"colour": "blue", "day": 1, "n": 2}]', text
+        schema = {'colour': Colour, 'day': Weekday}
+        assert loads(text, cls=BnumDecoder, schema=schema) == data
+
+    def test_by_name(self):
+        text = dumps({'day': Weekday.friday}, cls=BnumEncoder, by_name=True)
+        assert text == '{"day": "friday"}', text
+        data = loads(text, cls=BnumDecoder, schema={'day': Weekday}, by_name=True)
+        assert data['day'] is Weekday.friday
+
+    def test_values(self):
+        text = dumps([Number.two, Animal.pig], cls=BnumEncoder)
+        assert text == '[2, [4, "oink"]]', text
+        data = loads('{"animal": [2, "quack"], "number": 2}', cls=BnumDecoder,
+                     schema={'animal': Animal, 'number': Number})
+        assert data == {'animal': Animal.duck, 'number': Number.two}, data
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            loads('{"day": 8}', cls=BnumDecoder, schema={'day': Weekday})
+        with self.assertRaises(ValueError):
+            loads('{"day": {}}', cls=BnumDecoder, schema={'day': Weekday})
+        with self.assertRaises(TypeError):
+            dumps(object(), cls=BnumEncoder)
+
+    def test_object_hook(self):
+        data = loads('{"colour": "red"}', cls=BnumDecoder,
+                     schema={'colour': Colour}, object_hook=lambda obj: obj['colour'])
+        assert data is Colour.red
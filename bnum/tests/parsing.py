@@ -0,0 +1,62 @@
+
+from unittest import TestCase
+
+from bnum import ImplicitBnum, ExplicitBnum, from_one
+from bnum.parsing import AmbiguousName
+
+
+'''
+Test parsing names from text.
+'''
+
+
+class Weekday(ImplicitBnum, values=from_one):
+    monday, tuesday, wednesday, thursday, friday
+    saturday, sunday
+
+
+class Colour(ExplicitBnum, allow_aliases=True):
+    red = 1
+    reddish = 2
+    grey = 3
+    gray = 3
+    Green = 4
+    green = 5
+
+
+class ParseTest(TestCase):
+
+    def test_exact(self):
+        assert Weekday.parse('monday') is Weekday.monday
+        assert Weekday.parse('  MonDay\n') is Weekday.monday
+        with self.assertRaises(ValueError):
+            Weekday.parse('mondays')
+        with self.assertRaises(ValueError):
+            Weekday.parse('  ')
+
+    def test_prefix(self):
+        assert Weekday.parse('Mon') is Weekday.monday
+        assert Weekday.parse(' w ') is Weekday.wednesday
+        with self.assertRaises(ValueError):
+            Weekday.parse('mon', prefix=False)
+        with self.assertRaises(AmbiguousName) as context:
+            Weekday.parse('t')
+        assert context.exception.matches == (Weekday.tuesday, Weekday.thursday), \
+            context.exception.matches
+
+    def test_exact_before_prefix(self):
+        assert Colour.parse('RED') is Colour.red
+        assert Colour.parse('redd') is Colour.reddish
+        with self.assertRaises(AmbiguousName):
+            Colour.parse('re')
+
+    def test_aliases(self):
+        assert Colour.parse('gray') is Colour.parse('gra') is Colour.grey
+        assert Colour.parse('grey') is Colour.grey
+        with self.assertRaises(AmbiguousName) as context:
+            Colour.parse('gre')
+        assert context.exception.matches == (Colour.grey, Colour.Green, Colour.green), \
+            context.exception.matches
+        with self.assertRaises(AmbiguousName) as context:
+            Colour.parse('GREEN')
+        assert context.exception.matches == (Colour.Green, Colour.green)
@@ -0,0 +1,100 @@
+
+from unittest import TestCase
+
+from bnum import ImplicitBnum, ExplicitBnum
+from bnum.extensible import OpenBnum
+
+
+'''
+Test range and nearest value queries.
+'''
+
+
+class Threshold(ExplicitBnum):
+    low = 0
+    medium = 10
+    high = 100
+
+
+class FloatStooges(float, ExplicitBnum):
+    LARRY = 1.39
+    CURLY = 2.72
+    MOE = 3.142596
+
+
+class RangeTest(TestCase):
+
+    def test_range(self):
+        assert Threshold.range(0, 100) == (Threshold.low, Threshold.medium)
+        assert Threshold.range(1, 101) == (Threshold.medium, Threshold.high)
+        assert Threshold.range(high=10) == (Threshold.low, )
+        assert Threshold.range(10) == (Threshold.medium, Threshold.high)
+        assert Threshold.range() == tuple(Threshold)
+        assert Threshold.range(50, 5) == ()
+
+    def test_floor(self):
+        assert Threshold.floor(-1) is None
+        assert Threshold.floor(-1, Threshold.low) is Threshold.low
+        assert Threshold.floor(0) is Threshold.low
+        assert Threshold.floor(99.9) is Threshold.medium
+        assert Threshold.floor(1000) is Threshold.high
+        assert FloatStooges.floor(3) is FloatStooges.CURLY
+
+    def test_ceil(self):
+        assert Threshold.ceil(-1) is Threshold.low
+        assert Threshold.ceil(10) is Threshold.medium
+        assert Threshold.ceil(10.5) is Threshold.high
+        assert Threshold.ceil(101) is None
+
+    def test_nearest(self):
+        assert Threshold.nearest(-50) is Threshold.low
+        assert Threshold.nearest(4) is Threshold.low
+        assert Threshold.nearest(5) is Threshold.low  # a tie
+        assert Threshold.nearest(6) is Threshold.medium
+        assert Threshold.nearest(1e9) is Threshold.high
+        assert FloatStooges.nearest(3) is FloatStooges.MOE
+
+    def test_nan(self):
+        nan = float('nan')
+        for query in (Threshold.floor, Threshold.ceil, Threshold.nearest):
+            assert query(nan) is None, query
+
+    def test_names(self):
+        Colour = ImplicitBnum('Colour', 'red green blue')
+        assert Colour.range('c', 'r') == (Colour.green, )
+        assert Colour.floor('q') is Colour.green
+
+    def test_unordered(self):
+
+        class Strange(ExplicitBnum):
+            foo = 42
+            bar = 'fish'
+
+        with self.assertRaises(TypeError):
+            Strange.floor(1)
+
+    def test_empty(self):
+
+        class Empty(ExplicitBnum):
+            pass
+
+        assert Empty.range() == () and Empty.nearest(1) is None
+
+    def test_open(self):
+
+        class Level(OpenBnum):
+            low = 0
+            high = 100
+
+        assert Level.floor(60) is Level.low
+        medium = Level.register('medium', 50)
+        assert Level.floor(60) is medium
+        assert Level.range(1) == (medium, Level.high)
+
+    def test_reserved(self):
+        with self.assertRaises(ValueError) as context:
+            class Rounding(ImplicitBnum):
+                floor
+                ceil
+        message = str(context.exception)
+        assert 'ceil, floor' in message and 'nearest' not in message, message
@@ -0,0 +1,77 @@
+
+from unittest import TestCase
+
+from bnum import ImplicitBnum, ExplicitBnum, from_one
+
+
+'''
+Test decoding streams of values.
+'''
+
+
+class Weekday(ImplicitBnum, values=from_one):
+    monday, tuesday, wednesday, thursday, friday
+    saturday, sunday
+
+
+class Number(int, ExplicitBnum):
+    one = 1
+    two = 2
+
+
+class DecodeIterTest(TestCase):
+
+    VALUES = [1, 2, 9, 7, 9, [], 3]
+
+    def test_raise(self):
+        decoded = Weekday.decode_iter(self.VALUES, batch_size=2)
+        assert next(decoded) is Weekday.monday
+        assert next(decoded) is Weekday.tuesday
+        with self.assertRaises(ValueError):
+            next(decoded)
+        assert decoded.misses == {9: 1}, decoded.misses
+        with self.assertRaises(ValueError):
+            list(Weekday.decode_iter(self.VALUES))
+
+    def test_skip(self):
+        decoded = Weekday.decode_iter(self.VALUES, on_missing='skip', batch_size=3)
+        assert list(decoded) == [Weekday.monday, Weekday.tuesday,
+                                 Weekday.sunday, Weekday.wednesday]
+        assert decoded.misses == {9: 2, '[]': 1}, decoded.misses
+        assert decoded.missing == []
+
+    def test_collect(self):
+        decoded = Weekday.decode_iter(self.VALUES, on_missing='collect')
+        assert len(list(decoded)) == 4
+        assert decoded.missing == [(2, 9), (4, 9), (5, [])], decoded.missing
+
+    def test_default(self):
+        decoded = Weekday.decode_iter(self.VALUES, on_missing='default')
+        assert list(decoded) == [Weekday.monday, Weekday.tuesday, None,
+                                 Weekday.sunday, None, None, Weekday.wednesday]
+
+    def test_names(self):
+        decoded = Number.decode_iter(['one', 'three', 'two'], by_name=True,
+                                     on_missing='default', default=Number.one)
+        assert list(decoded) == [Number.one, Number.one, Number.two]
+        assert decoded.misses == {'three': 1}
+
+    def test_policy(self):
+        with self.assertRaises(ValueError):
+            Weekday.decode_iter([], on_missing='ignore')
+
+    def test_missing(self):
+
+        class Colour(ExplicitBnum):
+            red = 'red'
+            grey = 'grey'
+            @classmethod
+            def _missing_(cls, value):
+                if value == 'gray':
+                    return cls.grey
+
+        decoded = Colour.decode_iter(['red', 'gray', 'blue', 'grey'],
+                                     on_missing='collect')
+        assert list(decoded) == [Colour.red, Colour.grey, Colour.grey]
+        assert decoded.misses == {'blue': 1}
+        assert decoded.missing == [(2, 'blue')]
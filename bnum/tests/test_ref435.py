@@ -1,8 +1,8 @@
 
 import unittest
 from collections import OrderedDict
-from pickle import dumps, loads, PicklingError
-from bnum import ExplicitBnum
+from pickle import dumps, loads
+from bnum import ExplicitBnum, from_one
 
 try:
     class Stooges(ExplicitBnum):
@@ -20,6 +20,9 @@ try:
 except Exception as exc:
     IntStooges = exc
 
+class IntExplicitBnum(int, ExplicitBnum):
+    'accepts only int values'
+
 try:
     class FloatStooges(float, ExplicitBnum):
         LARRY = 1.39
@@ -312,111 +315,115 @@ class TestBnum(unittest.TestCase):
     #             [Season.SUMMER, Season.WINTER, Season.AUTUMN, Season.SPRING],
     #             )
 
-    # def test_programatic_function_string(self):
-    #     SummerMonth = ExplicitBnum('SummerMonth', 'june july august')
-    #     lst = list(SummerMonth)
-    #     self.assertEqual(len(lst), len(SummerMonth))
-    #     self.assertEqual(len(SummerMonth), 3, SummerMonth)
-    #     self.assertEqual(
-    #             [SummerMonth.june, SummerMonth.july, SummerMonth.august],
-    #             lst,
-    #             )
-    #     for i, month in enumerate('june july august'.split(), 1):
-    #         e = SummerMonth(i)
-    #         self.assertEqual(int(e.value), i)
-    #         self.assertNotEqual(e, i)
-    #         self.assertEqual(e.name, month)
-    #         self.assertIn(e, SummerMonth)
-    #         self.assertIs(type(e), SummerMonth)
-
-    # def test_programatic_function_string_list(self):
-    #     SummerMonth = ExplicitBnum('SummerMonth', ['june', 'july', 'august'])
-    #     lst = list(SummerMonth)
-    #     self.assertEqual(len(lst), len(SummerMonth))
-    #     self.assertEqual(len(SummerMonth), 3, SummerMonth)
-    #     self.assertEqual(
-    #             [SummerMonth.june, SummerMonth.july, SummerMonth.august],
-    #             lst,
-    #             )
-    #     for i, month in enumerate('june july august'.split(), 1):
-    #         e = SummerMonth(i)
-    #         self.assertEqual(int(e.value), i)
-    #         self.assertNotEqual(e, i)
-    #         self.assertEqual(e.name, month)
-    #         self.assertIn(e, SummerMonth)
-    #         self.assertIs(type(e), SummerMonth)
-
-    # def test_programatic_function_iterable(self):
-    #     SummerMonth = ExplicitBnum(
-    #             'SummerMonth',
-    #             (('june', 1), ('july', 2), ('august', 3))
-    #             )
-    #     lst = list(SummerMonth)
-    #     self.assertEqual(len(lst), len(SummerMonth))
-    #     self.assertEqual(len(SummerMonth), 3, SummerMonth)
-    #     self.assertEqual(
-    #             [SummerMonth.june, SummerMonth.july, SummerMonth.august],
-    #             lst,
-    #             )
-    #     for i, month in enumerate('june july august'.split(), 1):
-    #         e = SummerMonth(i)
-    #         self.assertEqual(int(e.value), i)
-    #         self.assertNotEqual(e, i)
-    #         self.assertEqual(e.name, month)
-    #         self.assertIn(e, SummerMonth)
-    #         self.assertIs(type(e), SummerMonth)
-
-    # def test_programatic_function_from_dict(self):
-    #     SummerMonth = ExplicitBnum(
-    #             'SummerMonth',
-    #             OrderedDict((('june', 1), ('july', 2), ('august', 3)))
-    #             )
-    #     lst = list(SummerMonth)
-    #     self.assertEqual(len(lst), len(SummerMonth))
-    #     self.assertEqual(len(SummerMonth), 3, SummerMonth)
-    #     self.assertEqual(
-    #             [SummerMonth.june, SummerMonth.july, SummerMonth.august],
-    #             lst,
-    #             )
-    #     for i, month in enumerate('june july august'.split(), 1):
-    #         e = SummerMonth(i)
-    #         self.assertEqual(int(e.value), i)
-    #         self.assertNotEqual(e, i)
-    #         self.assertEqual(e.name, month)
-    #         self.assertIn(e, SummerMonth)
-    #         self.assertIs(type(e), SummerMonth)
-
-    # def test_programatic_function_type(self):
-    #     SummerMonth = ExplicitBnum('SummerMonth', 'june july august', type=int)
-    #     lst = list(SummerMonth)
-    #     self.assertEqual(len(lst), len(SummerMonth))
-    #     self.assertEqual(len(SummerMonth), 3, SummerMonth)
-    #     self.assertEqual(
-    #             [SummerMonth.june, SummerMonth.july, SummerMonth.august],
-    #             lst,
-    #             )
-    #     for i, month in enumerate('june july august'.split(), 1):
-    #         e = SummerMonth(i)
-    #         self.assertEqual(e, i)
-    #         self.assertEqual(e.name, month)
-    #         self.assertIn(e, SummerMonth)
-    #         self.assertIs(type(e), SummerMonth)
-
-    # def test_programatic_function_type_from_subclass(self):
-    #     SummerMonth = IntExplicitBnum('SummerMonth', 'june july august')
-    #     lst = list(SummerMonth)
-    #     self.assertEqual(len(lst), len(SummerMonth))
-    #     self.assertEqual(len(SummerMonth), 3, SummerMonth)
-    #     self.assertEqual(
-    #             [SummerMonth.june, SummerMonth.july, SummerMonth.august],
-    #             lst,
-    #             )
-    #     for i, month in enumerate('june july august'.split(), 1):
-    #         e = SummerMonth(i)
-    #         self.assertEqual(e, i)
-    #         self.assertEqual(e.name, month)
-    #         self.assertIn(e, SummerMonth)
-    #         self.assertIs(type(e), SummerMonth)
+    def test_programatic_function_string(self):
+        SummerMonth = ExplicitBnum('SummerMonth', 'june july august',
+                                   values=from_one)
+        lst = list(SummerMonth)
+        self.assertEqual(len(lst), len(SummerMonth))
+        self.assertEqual(len(SummerMonth), 3, SummerMonth)
+        self.assertEqual(
+                [SummerMonth.june, SummerMonth.july, SummerMonth.august],
+                lst,
+                )
+        for i, month in enumerate('june july august'.split(), 1):
+            e = SummerMonth(i)
+            self.assertEqual(int(e.value), i)
+            self.assertNotEqual(e, i)
+            self.assertEqual(e.name, month)
+            self.assertIn(e, SummerMonth)
+            self.assertIs(type(e), SummerMonth)
+
+    def test_programatic_function_string_list(self):
+        SummerMonth = ExplicitBnum('SummerMonth', ['june', 'july', 'august'],
+                                   values=from_one)
+        lst = list(SummerMonth)
+        self.assertEqual(len(lst), len(SummerMonth))
+        self.assertEqual(len(SummerMonth), 3, SummerMonth)
+        self.assertEqual(
+                [SummerMonth.june, SummerMonth.july, SummerMonth.august],
+                lst,
+                )
+        for i, month in enumerate('june july august'.split(), 1):
+            e = SummerMonth(i)
+            self.assertEqual(int(e.value), i)
+            self.assertNotEqual(e, i)
+            self.assertEqual(e.name, month)
+            self.assertIn(e, SummerMonth)
+            self.assertIs(type(e), SummerMonth)
+
+    def test_programatic_function_iterable(self):
+        SummerMonth = ExplicitBnum(
+                'SummerMonth',
+                (('june', 1), ('july', 2), ('august', 3))
+                )
+        lst = list(SummerMonth)
+        self.assertEqual(len(lst), len(SummerMonth))
+        self.assertEqual(len(SummerMonth), 3, SummerMonth)
+        self.assertEqual(
+                [SummerMonth.june, SummerMonth.july, SummerMonth.august],
+                lst,
+                )
+        for i, month in enumerate('june july august'.split(), 1):
+            e = SummerMonth(i)
+            self.assertEqual(int(e.value), i)
+            self.assertNotEqual(e, i)
+            self.assertEqual(e.name, month)
+            self.assertIn(e, SummerMonth)
+            self.assertIs(type(e), SummerMonth)
+
+    def test_programatic_function_from_dict(self):
+        SummerMonth = ExplicitBnum(
+                'SummerMonth',
+                OrderedDict((('june', 1), ('july', 2), ('august', 3)))
+                )
+        lst = list(SummerMonth)
+        self.assertEqual(len(lst), len(SummerMonth))
+        self.assertEqual(len(SummerMonth), 3, SummerMonth)
+        self.assertEqual(
+                [SummerMonth.june, SummerMonth.july, SummerMonth.august],
+                lst,
+                )
+        for i, month in enumerate('june july august'.split(), 1):
+            e = SummerMonth(i)
+            self.assertEqual(int(e.value), i)
+            self.assertNotEqual(e, i)
+            self.assertEqual(e.name, month)
+            self.assertIn(e, SummerMonth)
+            self.assertIs(type(e), SummerMonth)
+
+    def test_programatic_function_type(self):
+        SummerMonth = ExplicitBnum('SummerMonth', 'june july august', type=int,
+                                   values=from_one)
+        lst = list(SummerMonth)
+        self.assertEqual(len(lst), len(SummerMonth))
+        self.assertEqual(len(SummerMonth), 3, SummerMonth)
+        self.assertEqual(
+                [SummerMonth.june, SummerMonth.july, SummerMonth.august],
+                lst,
+                )
+        for i, month in enumerate('june july august'.split(), 1):
+            e = SummerMonth(i)
+            self.assertEqual(e, i)
+            self.assertEqual(e.name, month)
+            self.assertIn(e, SummerMonth)
+            self.assertIs(type(e), SummerMonth)
+
+    def test_programatic_function_type_from_subclass(self):
+        SummerMonth = IntExplicitBnum('SummerMonth', 'june july august',
+                                   values=from_one)
+        lst = list(SummerMonth)
+        self.assertEqual(len(lst), len(SummerMonth))
+        self.assertEqual(len(SummerMonth), 3, SummerMonth)
+        self.assertEqual(
+                [SummerMonth.june, SummerMonth.july, SummerMonth.august],
+                lst,
+                )
+        for i, month in enumerate('june july august'.split(), 1):
+            e = SummerMonth(i)
+            self.assertEqual(e, i)
+            self.assertEqual(e.name, month)
+            self.assertIn(e, SummerMonth)
+            self.assertIs(type(e), SummerMonth)
 
     def test_subclassing(self):
         if isinstance(Name, Exception):
@@ -677,10 +684,10 @@ class TestBnum(unittest.TestCase):
         NI5 = NamedInt('test', 5)
         self.assertEqual(NI5, 5)
         self.assertEqual(NEI.y.value, 2)
-        with self.assertRaises(TypeError):
-            dumps(NEI.x)
-        with self.assertRaises(PicklingError):
-            dumps(NEI)
+        # instances are pickled by reference, so this works without
+        # __getnewargs__
+        self.assertIs(loads(dumps(NEI.x)), NEI.x)
+        self.assertIs(loads(dumps(NEI)), NEI)
 
     def test_tuple_subclass(self):
         class SomeTuple(tuple, ExplicitBnum):